@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import datetime, timezone
+import math
+
+
+TYPES = ("file", "directory")
+
+# The optional details following name, size and type in each row, as
+# (column, details key, whether the value is a timestamp)
+FIELDS = (
+    ("etags", "etag", False),
+    ("last_modified", "last_modified", True),
+    ("creation_time", "creation_time", True),
+    ("content_md5", "content_md5", False),
+    ("blob_types", "blob_type", False),
+)
+
+
+def _take(values, indices):
+    taken = [values[i] for i in indices]
+    if isinstance(values, array):
+        return array(values.typecode, taken)
+    return type(values)(taken)
+
+
+class Listing(Sequence):
+    """
+    Compact, sorted store of directory listing entries
+
+    Entries are held in parallel columns rather than one dict per entry, and
+    are only turned into the usual fsspec details dicts when they are accessed,
+    so very large listings can be kept in ``dircache`` cheaply.  The entries
+    are sorted by name, which allows exact and prefix lookups by binary search.
+
+    Parameters
+    ----------
+    rows: iterable of tuples
+        (name, size, type, etag, last_modified, creation_time, content_md5,
+        blob_type) for each entry.  ``size`` may be None if it is unknown, and
+        the remaining details may be None, or left off the end of the row, for
+        entries, such as directories, which do not have them
+    """
+
+    __slots__ = ("names", "sizes", "types") + tuple(column for column, _, _ in FIELDS)
+
+    def __init__(self, rows=()):
+        rows = sorted(rows, key=lambda row: row[0])
+        self.names = [row[0] for row in rows]
+        self.sizes = array("q", [-1 if row[1] is None else row[1] for row in rows])
+        self.types = bytearray(TYPES.index(row[2]) for row in rows)
+        for i, (column, _, is_time) in enumerate(FIELDS, 3):
+            values = [row[i] if len(row) > i else None for row in rows]
+            if is_time:
+                values = array(
+                    "d", [math.nan if v is None else v.timestamp() for v in values]
+                )
+            setattr(self, column, values)
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build a listing from an iterable of details dicts"""
+        return cls(
+            (entry["name"], entry.get("size"), entry["type"])
+            + tuple(entry.get(key) for _, key, _ in FIELDS)
+            for entry in entries
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.subset(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Listing index out of range")
+        size = self.sizes[index]
+        entry = {
+            "name": self.names[index],
+            "size": None if size < 0 else size,
+            "type": TYPES[self.types[index]],
+        }
+        for column, key, is_time in FIELDS:
+            value = getattr(self, column)[index]
+            if is_time and not math.isnan(value):
+                entry[key] = datetime.fromtimestamp(value, tz=timezone.utc)
+            elif not is_time and value is not None:
+                entry[key] = value
+        return entry
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"Listing({list(self)!r})"
+
+    def __add__(self, other):
+        if not isinstance(other, Listing):
+            return NotImplemented
+        combined = Listing()
+        for column in self.__slots__:
+            setattr(combined, column, getattr(self, column) + getattr(other, column))
+        return combined.subset(
+            sorted(range(len(combined)), key=combined.names.__getitem__)
+        )
+
+    def subset(self, indices):
+        """Return a new listing holding only the entries at the given indices"""
+        out = Listing()
+        for column in self.__slots__:
+            setattr(out, column, _take(getattr(self, column), indices))
+        return out
+
+    def find(self, name: str):
+        """Index of the entry with exactly this name, or -1"""
+        i = bisect_left(self.names, name)
+        if i < len(self.names) and self.names[i] == name:
+            return i
+        return -1
+
+    def get(self, path: str, default=None):
+        """
+        Details of the entry for path, whether or not its name carries a
+        trailing delimiter
+        """
+        path = path.rstrip("/")
+        for name in [path, f"{path}/"]:
+            i = self.find(name)
+            if i >= 0:
+                return self[i]
+        return default
+
+    def startswith(self, prefix: str):
+        """Return the listing of entries whose names begin with prefix"""
+        start = bisect_left(self.names, prefix)
+        stop = start
+        while stop < len(self.names) and self.names[stop].startswith(prefix):
+            stop += 1
+        return self.subset(range(start, stop))
+
+    def files(self):
+        """Return the listing of entries which are not directories"""
+        return self.subset(
+            [i for i, kind in enumerate(self.types) if TYPES[kind] == "file"]
+        )
+
+    def put(self, row):
+        """
+        Add the entry for row in place, at its sorted position, replacing any
+        entry which has the same name
+        """
+        i = bisect_left(self.names, row[0])
+        replace = i < len(self.names) and self.names[i] == row[0]
+        values = [row[0], -1 if row[1] is None else row[1], TYPES.index(row[2])]
+        for j, (_, _, is_time) in enumerate(FIELDS, 3):
+            value = row[j] if len(row) > j else None
+            if is_time:
+                value = math.nan if value is None else value.timestamp()
+            values.append(value)
+        for column, value in zip(self.__slots__, values):
+            if replace:
+                getattr(self, column)[i] = value
+            else:
+                getattr(self, column).insert(i, value)
+
+    def updated(self, rows):
+        """
+        Return a copy of the listing with rows added, replacing any entries
+        which have the same names
+        """
+        out = self.subset(range(len(self)))
+        for row in rows:
+            out.put(row)
+        return out
+
+    def with_delimiter(self, delimiter: str = "/"):
+        """Return a copy of the listing, with directory names ending in delimiter"""
+        out = self.subset(range(len(self)))
+        out.names = [
+            f"{name.rstrip(delimiter)}{delimiter}"
+            if TYPES[kind] == "directory"
+            else name
+            for name, kind in zip(self.names, self.types)
+        ]
+        return out.subset(sorted(range(len(out)), key=out.names.__getitem__))
@@ -3,20 +3,36 @@
 
 from __future__ import absolute_import, division, print_function
 
+import asyncio
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
 import io
 from glob import has_magic
+import hashlib
 import logging
 import os
+import threading
+import time
 import warnings
 
-from azure.core.exceptions import ResourceNotFoundError, ResourceExistsError
+from azure.core import MatchConditions
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
 from azure.storage.blob._shared.base_client import create_configuration
 from azure.datalake.store import AzureDLFileSystem, lib
 from azure.datalake.store.core import AzureDLFile, AzureDLPath
 from azure.storage.blob.aio import BlobServiceClient as AIOBlobServiceClient
-from azure.storage.blob import BlobServiceClient
-from azure.storage.blob.aio._list_blobs_helper import BlobPrefix
-from azure.storage.blob._models import BlobBlock, BlobProperties, BlobType
+from azure.storage.blob import (
+    BlobSasPermissions,
+    generate_blob_sas,
+)
+from azure.storage.blob._generated.models import SourceModifiedAccessConditions
+from azure.storage.blob._models import BlobBlock, BlobType
 from fsspec import AbstractFileSystem
 from fsspec.asyn import (
     maybe_sync,
@@ -24,12 +40,155 @@ from fsspec.asyn import (
     get_loop,
     sync_wrapper,
 )
-from fsspec.utils import infer_storage_options, tokenize
+from fsspec.dircache import DirCache
+from fsspec.implementations.local import make_path_posix
+from fsspec.utils import infer_storage_options, other_paths, tokenize
+
+from .listing import Listing
 
 
 logger = logging.getLogger(__name__)
 
 
+# The most blocks that can be committed to a single block blob
+MAX_BLOCKS_PER_BLOB = 50000
+
+# The default size of the blocks staged from the source of a block copy, which
+# never pass through the client, and the largest range Azure stages from a URL
+COPY_BLOCK_SIZE = 100 * 2 ** 20
+
+
+# Seconds between checks on a copy which is still pending, doubling up to the
+# maximum
+COPY_POLL_INTERVAL = 0.1
+MAX_COPY_POLL_INTERVAL = 5
+
+# The largest gap between ranges merged into one request by cat_ranges, and
+# the largest merged request
+CAT_RANGES_MAX_GAP = 2 ** 16
+CAT_RANGES_MAX_BLOCK = 2 ** 25
+
+# The most sub-requests that can be sent in one blob batch request
+BATCH_DELETE_SIZE = 256
+
+
+async def _azip(items, responses):
+    """Pair each of items with the response for it from an async iterator"""
+    items = iter(items)
+    async for response in responses:
+        yield next(items), response
+
+
+async def _gather_or_cancel(aws):
+    """
+    Run the awaitables concurrently, as ``asyncio.gather`` does, but once one
+    of them fails, cancel the rest and wait for them to settle before raising
+    its error, so that none are left running in the background
+
+    The files, blocks and ranges of every concurrent transfer are run this way.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _md5(path):
+    """Hex digest of the MD5 of the contents of the local file at path"""
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(2 ** 20), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _read_at(f, length, offset, lock):
+    """
+    Read up to length bytes at offset in the open file f
+
+    Without ``os.pread``, the file is read from its position after a seek, so
+    this is done holding lock, which all the threads reading f must share
+    """
+    if hasattr(os, "pread"):
+        return os.pread(f.fileno(), length, offset)
+    with lock:
+        f.seek(offset)
+        return f.read(length)
+
+
+def _write_at(f, data, offset, lock):
+    """
+    Write all of data at offset in the open file f
+
+    As with ``_read_at``, without ``os.pwrite`` this is done holding lock
+    """
+    if hasattr(os, "pwrite"):
+        data = memoryview(data)
+        while data:
+            written = os.pwrite(f.fileno(), data, offset)
+            data = data[written:]
+            offset += written
+    else:
+        with lock:
+            f.seek(offset)
+            f.write(data)
+
+
+class _MissingPaths(MutableMapping):
+    """
+    Paths found not to exist, each remembered for ``expiry_time`` seconds,
+    keeping at most the ``max_paths`` most recently added
+
+    Parameters
+    ----------
+    expiry_time: float
+        Seconds for which a path is remembered.  If 0, nothing is remembered
+
+    max_paths: int
+        The most paths to remember at once
+    """
+
+    def __init__(self, expiry_time: float, max_paths: int):
+        self.expiry_time = expiry_time
+        self.max_paths = max_paths
+        # oldest first, so that expired entries are at the front
+        self._times = OrderedDict()
+
+    def _expire(self):
+        cutoff = time.time() - self.expiry_time
+        while self._times and next(iter(self._times.values())) < cutoff:
+            self._times.popitem(last=False)
+
+    def __getitem__(self, path):
+        self._expire()
+        self._times[path]
+        return True
+
+    def __setitem__(self, path, value):
+        if not self.expiry_time or not self.max_paths:
+            return
+        self._times.pop(path, None)
+        self._times[path] = time.time()
+        self._expire()
+        while len(self._times) > self.max_paths:
+            self._times.popitem(last=False)
+
+    def __delitem__(self, path):
+        del self._times[path]
+
+    def __iter__(self):
+        self._expire()
+        return iter(list(self._times))
+
+    def __len__(self):
+        self._expire()
+        return len(self._times)
+
+
 class AzureDatalakeFileSystem(AbstractFileSystem):
     """
     Access Azure Datalake Gen1 as if it were a file system.
@@ -294,6 +453,17 @@ class AzureBlobFileSystem(AsyncFileSystem):
     default_cache_type: string ('bytes')
         If given, the default cache_type value used for "open()".  Set to none if no caching
         is desired.  Docs in fsspec
+    walk_concurrency: int (32)
+        The maximum number of directory listings to have in flight at once, when
+        walking the filesystem
+    missing_paths_expiry_time: float (10)
+        Time in seconds that a path found not to exist is remembered as missing, so that
+        repeated checks for it do not go back to Azure.  Set to 0 to disable.
+    max_missing_paths: int (10000)
+        The number of most recent missing paths that are remembered
+    max_concurrency: int (32)
+        The maximum number of requests to have in flight at once, when working
+        on many paths at a time, as in ``info_many``
 
     Pass on to fsspec:
 
@@ -346,6 +516,10 @@ class AzureBlobFileSystem(AsyncFileSystem):
         asynchronous: bool = False,
         default_fill_cache: bool = True,
         default_cache_type: str = "bytes",
+        walk_concurrency: int = 32,
+        missing_paths_expiry_time: float = 10,
+        max_missing_paths: int = 10000,
+        max_concurrency: int = 32,
         **kwargs,
     ):
         super_kwargs = {
@@ -368,18 +542,19 @@ class AzureBlobFileSystem(AsyncFileSystem):
         self.loop = loop or get_loop()
         self.default_fill_cache = default_fill_cache
         self.default_cache_type = default_cache_type
+        self.walk_concurrency = walk_concurrency
+        self.max_concurrency = max_concurrency
+        self.missing_paths = _MissingPaths(missing_paths_expiry_time, max_missing_paths)
+        # The details of single blobs, kept apart from the directory listings,
+        # since a blob and a directory can share a name
+        self.infocache = DirCache(**super_kwargs)
         if (
             self.credential is None
             and self.account_key is None
             and self.sas_token is None
             and self.client_id is not None
         ):
-            (
-                self.credential,
-                self.sync_credential,
-            ) = self._get_credential_from_service_principal()
-        else:
-            self.sync_credential = None
+            self.credential = self._get_credential_from_service_principal()
         self.do_connect()
 
     @classmethod
@@ -417,27 +592,18 @@ class AzureBlobFileSystem(AsyncFileSystem):
 
         Returns
         -------
-        Tuple of (Async Credential, Sync Credential).
+        An async ClientSecretCredential, shared by the filesystem and its files
         """
-        from azure.identity import ClientSecretCredential
         from azure.identity.aio import (
             ClientSecretCredential as AIOClientSecretCredential,
         )
 
-        async_credential = AIOClientSecretCredential(
-            tenant_id=self.tenant_id,
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-        )
-
-        sync_credential = ClientSecretCredential(
+        return AIOClientSecretCredential(
             tenant_id=self.tenant_id,
             client_id=self.client_id,
             client_secret=self.client_secret,
         )
 
-        return (async_credential, sync_credential)
-
     def do_connect(self):
         """Connect to the BlobServiceClient, using user-specified connection details.
         Tries credentials first, then connection string and finally account key
@@ -502,40 +668,206 @@ class AzureBlobFileSystem(AsyncFileSystem):
             return path.split(delimiter, 1)
 
     def info(self, path, refresh=False, **kwargs):
-        fetch_from_azure = (path and self._ls_from_cache(path) is None) or refresh
-        if fetch_from_azure:
-            return maybe_sync(self._info, self, path)
-        return super().info(path)
+        return maybe_sync(self._info, self, path, refresh=refresh, **kwargs)
 
-    async def _info(self, path, **kwargs):
+    async def _info(self, path, refresh=False, delimiter="/", **kwargs):
         """Give details of entry at path
         Returns a single dictionary, with exactly the same information as ``ls``
         would with ``detail=True``.
-        The default implementation should calls ls and could be overridden by a
-        shortcut. kwargs are passed on to ```ls()``.
-        Some file systems might not be able to measure the file's size, in
-        which case, the returned dict will include ``'size': None``.
+
+        Cached listings are used when available.  Otherwise the blob properties
+        are requested directly, and if there is no blob at path, a single blob
+        below path is enough to show that it is a directory, so the parent
+        directory is never listed.
+
+        Parameters
+        ----------
+        path: str
+            Path to an Azure Blob with its container name
+
+        refresh: bool
+            If True, do not use the cache
+
+        delimiter: str
+            Delimiter used to split paths
+
         Returns
         -------
         dict with keys: name (full path in the FS), size (in bytes), type (file,
         directory, or something else) and other FS-specific keys.
         """
-        path = self._strip_protocol(path)
-        out = await self._ls(self._parent(path), **kwargs)
-        out = [o for o in out if o["name"].rstrip("/") == path]
-        if out:
-            return out[0]
-        out = await self._ls(path, **kwargs)
-        path = path.rstrip("/")
-        out1 = [o for o in out if o["name"].rstrip("/") == path]
-        if len(out1) == 1:
-            if "size" not in out1[0]:
-                out1[0]["size"] = None
-            return out1[0]
-        elif len(out1) > 1 or out:
-            return {"name": path, "size": 0, "type": "directory"}
+        path = self._strip_protocol(path).rstrip(delimiter)
+        container_name, blob = self.split_path(path, delimiter=delimiter)
+        if not container_name:
+            return {"name": "", "size": 0, "type": "directory"}
+        if not refresh:
+            info = self._info_from_cache(path)
+            if info is not None:
+                return info
+            if path in self.missing_paths:
+                raise FileNotFoundError
+
+        container_client = self.service_client.get_container_client(
+            container=container_name
+        )
+        if not blob:
+            try:
+                await container_client.get_container_properties()
+            except ResourceNotFoundError:
+                self.missing_paths[path] = True
+                raise FileNotFoundError
+            return {
+                "name": f"{container_name}{delimiter}",
+                "size": 0,
+                "type": "directory",
+            }
+
+        try:
+            blob_client = container_client.get_blob_client(blob=blob)
+            properties = await blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            pass
         else:
-            raise FileNotFoundError
+            listing = await self._details([properties])
+            self.infocache[path] = listing
+            return listing[0]
+
+        try:
+            async for _ in container_client.list_blobs(
+                name_starts_with=f"{blob}{delimiter}", results_per_page=1
+            ):
+                return {"name": f"{path}{delimiter}", "size": 0, "type": "directory"}
+        except ResourceNotFoundError:
+            pass
+        self.missing_paths[path] = True
+        raise FileNotFoundError
+
+    def info_many(self, paths, on_error="raise", max_concurrency=None):
+        return maybe_sync(
+            self._info_many,
+            self,
+            paths,
+            on_error=on_error,
+            max_concurrency=max_concurrency,
+        )
+
+    async def _info_many(self, paths, on_error="raise", max_concurrency=None):
+        """
+        Give details of many paths at once
+
+        Paths are answered from the cached listings where possible, including
+        paths missing from the cached listing of their parent.  The details of
+        the rest are fetched concurrently, with at most ``max_concurrency``
+        requests in flight.
+
+        Parameters
+        ----------
+        paths: list of str
+            Paths to Azure Blobs or directories, with their container names
+
+        on_error: "raise" or "return"
+            If "raise", the first error, such as FileNotFoundError for a missing
+            path, is raised.  If "return", the exception is given in place of
+            the details of that path
+
+        max_concurrency: int
+            Overrides the filesystem's ``max_concurrency``
+
+        Returns
+        -------
+        list of dicts, in the same order as paths
+        """
+        if on_error not in ["raise", "return"]:
+            raise ValueError(f"on_error must be 'raise' or 'return', not {on_error}")
+        paths = [self._strip_protocol(p).rstrip("/") for p in paths]
+        results = [None] * len(paths)
+        pending = []
+        for i, path in enumerate(paths):
+            try:
+                results[i] = self._info_from_cache(path)
+            except FileNotFoundError as e:
+                results[i] = e
+            if results[i] is None:
+                pending.append(i)
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _fetch(i):
+            async with semaphore:
+                results[i] = await self._info(paths[i])
+
+        fetched = await asyncio.gather(
+            *[_fetch(i) for i in pending], return_exceptions=True
+        )
+        for i, result in zip(pending, fetched):
+            if isinstance(result, Exception):
+                results[i] = result
+        if on_error == "raise":
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def exists_many(self, paths, max_concurrency=None):
+        return maybe_sync(
+            self._exists_many, self, paths, max_concurrency=max_concurrency
+        )
+
+    async def _exists_many(self, paths, max_concurrency=None):
+        """Whether there is a file or directory at each of the paths"""
+        infos = await self._info_many(
+            paths, on_error="return", max_concurrency=max_concurrency
+        )
+        return [not isinstance(info, Exception) for info in infos]
+
+    def sizes(self, paths, max_concurrency=None):
+        return maybe_sync(self._sizes, self, paths, max_concurrency=max_concurrency)
+
+    async def _sizes(self, paths, max_concurrency=None):
+        """Size in bytes of each of the paths"""
+        infos = await self._info_many(paths, max_concurrency=max_concurrency)
+        return [info.get("size") for info in infos]
+
+    def _info_from_cache(self, path: str):
+        """
+        Look up the details of path in the cached details of the blob at path,
+        or else in the cached listings of path and its parent
+
+        A cached listing of the parent holds all of its children, so a path
+        missing from it does not exist.
+
+        Returns
+        -------
+        dict, or None if neither listing is cached
+
+        Raises
+        ------
+        FileNotFoundError if the cached listing of the parent does not include
+        path
+        """
+        try:
+            return self.infocache[path][0]
+        except KeyError:
+            pass
+        try:
+            listing = self.dircache[path]
+        except KeyError:
+            pass
+        else:
+            info = listing.get(path)
+            if info is not None:
+                return info
+            if listing:
+                # only a directory can have a listing of its own
+                return {"name": f"{path}/", "size": 0, "type": "directory"}
+        try:
+            listing = self.dircache[self._parent(path)]
+        except KeyError:
+            return None
+        info = listing.get(path)
+        if info is None:
+            raise FileNotFoundError(path)
+        return info
 
     def glob(self, path, **kwargs):
         return maybe_sync(self._glob, self, path)
@@ -579,14 +911,17 @@ class AzureBlobFileSystem(AsyncFileSystem):
         elif "/" in path[:ind]:
             ind2 = path[:ind].rindex("/")
             root = path[: ind2 + 1]
-            depth = 20 if "**" in path else path[ind2 + 1 :].count("/") + 1
+            depth = None if "**" in path else path[ind2 + 1 :].count("/") + 1
         else:
             root = ""
-            depth = 20 if "**" in path else 1
+            depth = None if "**" in path else 1
 
-        allpaths = await self._find(
-            root, maxdepth=depth, withdirs=True, detail=True, **kwargs
+        allpaths = await self._find_listing(
+            root, maxdepth=depth, withdirs=True, **kwargs
         )
+        if has_magic(path):
+            # only the entries starting with the literal part of path can match
+            allpaths = allpaths.startswith(path[:ind])
         pattern = (
             "^"
             + (
@@ -605,15 +940,15 @@ class AzureBlobFileSystem(AsyncFileSystem):
         pattern = re.sub("[*]{2}", "=PLACEHOLDER=", pattern)
         pattern = re.sub("[*]", "[^/]*", pattern)
         pattern = re.compile(pattern.replace("=PLACEHOLDER=", ".*"))
-        out = {
-            p: allpaths[p]
-            for p in sorted(allpaths)
+        matches = [
+            i
+            for i, p in enumerate(allpaths.names)
             if pattern.match(p.replace("//", "/").rstrip("/"))
-        }
+        ]
         if detail:
-            return out
+            return {allpaths.names[i]: allpaths[i] for i in matches}
         else:
-            return list(out)
+            return [allpaths.names[i] for i in matches]
 
     def ls(
         self,
@@ -634,9 +969,10 @@ class AzureBlobFileSystem(AsyncFileSystem):
             return_glob=return_glob,
         )
         if detail:
-            return files
+            # a plain list of dicts, so callers are free to add or change them
+            return list(files)
         else:
-            return list(sorted(set([f["name"] for f in files])))
+            return list(sorted(set(files.names)))
 
     async def _ls(
         self,
@@ -671,7 +1007,7 @@ class AzureBlobFileSystem(AsyncFileSystem):
         container, path = self.split_path(path)
 
         if invalidate_cache:
-            self.dircache.clear()
+            self.invalidate_cache(target_path)
 
         if (container in ["", ".", delimiter]) and (path in ["", delimiter]):
             if path not in self.dircache or invalidate_cache or return_glob:
@@ -682,7 +1018,7 @@ class AzureBlobFileSystem(AsyncFileSystem):
                 contents = self.service_client.list_containers(include_metadata=True)
                 containers = [c async for c in contents]
                 files = await self._details(containers)
-                self.dircache[path] = files
+                self._cache_listing(path, files)
                 return files
             return self.dircache[path]
         else:
@@ -693,37 +1029,27 @@ class AzureBlobFileSystem(AsyncFileSystem):
                         container=container
                     )
                     path = path.strip("/")
-                    blobs = container_client.walk_blobs(name_starts_with=path)
+                    prefix = f"{path}{delimiter}" if path else ""
+                    blobs = container_client.walk_blobs(
+                        name_starts_with=prefix, delimiter=delimiter
+                    )
 
-                    # Check the depth that needs to be screened
-                    depth = target_path.count("/")
+                    # Subdirectories come back as a BlobPrefix, which is a
+                    # directory entry in its own right, so only the direct
+                    # children of path are ever paged through
                     outblobs = []
+                    is_dir = False
                     try:
                         async for next_blob in blobs:
-                            if depth in [0, 1] and path == "":
-                                outblobs.append(next_blob)
-                            elif isinstance(next_blob, BlobProperties):
-                                if next_blob["name"].count("/") == depth:
-                                    outblobs.append(next_blob)
-                                elif not next_blob["name"].endswith("/") and (
-                                    next_blob["name"].count("/") == (depth - 1)
-                                ):
-                                    outblobs.append(next_blob)
+                            if next_blob["name"] == prefix:
+                                # directory marker for path itself
+                                is_dir = True
                             else:
-                                async for blob_ in next_blob:
-                                    if isinstance(blob_, BlobProperties) or isinstance(
-                                        blob_, BlobPrefix
-                                    ):
-                                        if blob_["name"].endswith("/"):
-                                            if (
-                                                blob_["name"].rstrip("/").count("/")
-                                                == depth
-                                            ):
-                                                outblobs.append(blob_)
-                                        elif blob_["name"].count("/") == (depth):
-                                            outblobs.append(blob_)
-                                        else:
-                                            pass
+                                outblobs.append(next_blob)
+                        if not outblobs and not is_dir and path:
+                            # path has no children, but may be a file
+                            blob_client = container_client.get_blob_client(blob=path)
+                            outblobs.append(await blob_client.get_blob_properties())
                     except ResourceNotFoundError:
                         raise FileNotFoundError
                     if return_glob:
@@ -731,12 +1057,7 @@ class AzureBlobFileSystem(AsyncFileSystem):
                         return finalblobs
                     else:
                         finalblobs = await self._details(outblobs)
-                    if not finalblobs:
-                        if not await self._exists(target_path):
-                            raise FileNotFoundError
-                        else:
-                            return []
-                    self.dircache[target_path] = finalblobs
+                    self._cache_listing(target_path, finalblobs)
                     return finalblobs
             return self.dircache[target_path]
 
@@ -744,7 +1065,7 @@ class AzureBlobFileSystem(AsyncFileSystem):
         self, contents, delimiter="/", return_glob: bool = False, **kwargs
     ):
         """
-        Return a list of dictionaries of specifying details about the contents
+        Return a listing of the details about the contents
 
         Parameters
         ----------
@@ -757,36 +1078,53 @@ class AzureBlobFileSystem(AsyncFileSystem):
 
         Returns
         -------
-        List of dicts
-            Returns details about the contents, such as name, size and type
+        Listing
+            A sequence of details about the contents, such as name, size and type,
+            which are stored compactly and only turned into dicts when accessed
         """
 
-        output = []
+        rows = []
         for content in contents:
-            data = {}
+            properties = ()
             if content.has_key("container"):  # NOQA
                 fname = f"{content.container}{delimiter}{content.name}"
-                data.update({"name": fname})
                 if content.has_key("size"):  # NOQA
-                    data.update({"size": content.size})
+                    size = content.size
+                    properties = self._blob_properties(content)
                 else:
-                    data.update({"size": 0})
-                if data["size"] == 0 and data["name"].endswith(delimiter):
-                    data.update({"type": "directory"})
+                    size = 0
+                if size == 0 and fname.endswith(delimiter):
+                    kind = "directory"
                 else:
-                    data.update({"type": "file"})
+                    kind = "file"
             else:
                 fname = f"{content.name}{delimiter}"
-                data.update({"name": fname})
-                data.update({"size": 0})
-                data.update({"type": "directory"})
+                size = 0
+                kind = "directory"
             if return_glob:
-                data.update({"name": data["name"].rstrip("/")})
-            output.append(data)
-        return output
+                fname = fname.rstrip("/")
+            rows.append((fname, size, kind) + properties)
+        return Listing(rows)
+
+    @staticmethod
+    def _blob_properties(blob):
+        """
+        The etag, last_modified, creation_time, content_md5 and blob_type of a
+        blob, as they are stored in a ``Listing`` row
+        """
+        content_settings = getattr(blob, "content_settings", None)
+        content_md5 = getattr(content_settings, "content_md5", None)
+        blob_type = getattr(blob, "blob_type", None)
+        return (
+            blob.etag,
+            blob.last_modified,
+            getattr(blob, "creation_time", None),
+            bytes(content_md5).hex() if content_md5 else None,
+            getattr(blob_type, "value", blob_type),
+        )
 
     def find(self, path, maxdepth=None, withdirs=False, **kwargs):
-        return maybe_sync(self._find, self, path, maxdepth, withdirs)
+        return maybe_sync(self._find, self, path, maxdepth, withdirs, **kwargs)
 
     async def _find(self, path, maxdepth=None, withdirs=False, **kwargs):
         """List all files below path.
@@ -802,38 +1140,167 @@ class AzureBlobFileSystem(AsyncFileSystem):
         kwargs are passed to ``ls``.
         """
         # TODO: allow equivalent of -name parameter
-        path = self._strip_protocol(path)
-        out = dict()
         detail = kwargs.pop("detail", False)
-        async for path, dirs, files in self._async_walk(
-            path, maxdepth, detail=True, **kwargs
-        ):
-            if files == []:
-                files = {}
-                dirs = {}
-            if withdirs:
-                files.update(dirs)
-            out.update({info["name"]: info for name, info in files.items()})
-        if await self._isfile(path) and path not in out:
-            # walk works on directories, but find should also return [path]
-            # when path happens to be a file
-            out[path] = {}
-        names = sorted(out)
+        listing = await self._find_listing(
+            path, maxdepth=maxdepth, withdirs=withdirs, **kwargs
+        )
         if not detail:
-            return names
+            return list(listing.names)
+        else:
+            return {name: listing[i] for i, name in enumerate(listing.names)}
+
+    async def _find_listing(self, path, maxdepth=None, withdirs=False, **kwargs):
+        """
+        Listing of everything below path, sorted by name, as used by ``find``
+        and ``glob``
+
+        Returns
+        -------
+        Listing
+        """
+        path = self._strip_protocol(path)
+        container_name, _ = self.split_path(path)
+        if maxdepth is None and container_name not in ["", "."]:
+            # An unbounded search only needs a single flat listing of the prefix
+            try:
+                listing = await self._ls_flat(path)
+            except FileNotFoundError:
+                listing = Listing()
         else:
-            return {name: out[name] for name in names}
+            out = {}
+            async for _, dirs, files in self._async_walk(
+                path, maxdepth, detail=True, **kwargs
+            ):
+                out.update({info["name"]: info for info in files.values()})
+                out.update({info["name"]: info for info in dirs.values()})
+            listing = Listing.from_entries(out.values())
+        if not withdirs:
+            listing = listing.files()
+        if not listing:
+            # walk works on directories, but find should also return [path]
+            # when path happens to be a file
+            try:
+                info = await self._info(path)
+            except FileNotFoundError:
+                pass
+            else:
+                if info["type"] == "file":
+                    listing = Listing.from_entries([info])
+        return listing
+
+    async def _ls_flat(self, path: str, delimiter: str = "/"):
+        """
+        List everything below path with a single, delimiter-free listing
+
+        The blob names are paged through once with ``list_blobs``, and the
+        directories are implied from the names on the client side, rather
+        than listing each directory level separately.
+
+        Parameters
+        ----------
+        path: str
+            Path to an Azure Blob with its container name
+
+        delimiter: str
+            Delimiter used to split paths
+
+        Returns
+        -------
+        Listing
+            The files and directories below path, named without a trailing
+            delimiter
+        """
+        container_name, prefix = self.split_path(path, delimiter=delimiter)
+        prefix = prefix.strip(delimiter)
+        if prefix:
+            prefix = f"{prefix}{delimiter}"
+        container_client = self.service_client.get_container_client(
+            container=container_name
+        )
+        blobs = []
+        dirs = {}
+        try:
+            async for blob in container_client.list_blobs(name_starts_with=prefix):
+                if blob.name == prefix:
+                    # directory marker for path itself
+                    continue
+                # Every intermediate level between path and the blob is a directory
+                parts = blob.name[len(prefix) :].rstrip(delimiter).split(delimiter)
+                if blob.name.endswith(delimiter) and not blob.size:
+                    # directory marker
+                    parts.append("")
+                else:
+                    blobs.append(blob)
+                for i in range(1, len(parts)):
+                    dirname = delimiter.join(
+                        [container_name, prefix + delimiter.join(parts[:i])]
+                    )
+                    dirs[dirname] = (dirname, 0, "directory")
+        except ResourceNotFoundError:
+            raise FileNotFoundError
+        listing = await self._details(blobs, return_glob=True) + Listing(dirs.values())
+        if listing:
+            self._cache_flat_listing(path.strip(delimiter), listing, delimiter)
+        return listing
+
+    def _cache_flat_listing(self, path: str, listing, delimiter: str = "/"):
+        """
+        Fill ``dircache`` with the listing of every directory below path
+
+        A flat listing holds the complete contents of each of these directories,
+        so later calls to ``ls`` and ``info`` on them, or their contents, can be
+        answered without further requests.
+        """
+        listing = listing.with_delimiter(delimiter)
+        children = {path: []}
+        for i, name in enumerate(listing.names):
+            if name.endswith(delimiter):
+                children.setdefault(name.rstrip(delimiter), [])
+            children.setdefault(self._parent(name), []).append(i)
+        for directory, indices in children.items():
+            self._cache_listing(directory, listing.subset(indices))
+
+    def _cache_listing(self, path: str, listing):
+        """
+        Store the listing of path in ``dircache``, discarding the details
+        cached for its files by ``info``, which are older than the listing
+        """
+        self.dircache[path] = listing
+        for name in listing.files().names:
+            self.infocache.pop(name, None)
 
     def _walk(self, path, dirs, files):
         for p, d, f in zip([path], [dirs], [files]):
             yield p, d, f
 
+    def walk(self, path, maxdepth=None, **kwargs):
+        path = self._strip_protocol(path)
+        depth = 0
+        level = [path]
+        while level:
+            # each level is listed as a whole, and yielded before the next one
+            # is listed, so that callers may prune dirs as with ``os.walk``
+            next_level = []
+            for p, dirs, files, dir_paths in maybe_sync(
+                self._walk_level, self, level, **kwargs
+            ):
+                yield p, dirs, files
+                next_level.extend(dir_paths[d] for d in dirs)
+            depth += 1
+            if maxdepth is not None and depth >= maxdepth:
+                return
+            level = next_level
+
     async def _async_walk(self, path: str, maxdepth=None, **kwargs):
         """Return all files belows path
 
         List all files, recursing into subdirectories; output is iterator-style,
         like ``os.walk()``. For a simple list of files, ``find()`` is available.
 
+        The tree is walked breadth-first, and the directories of each level are
+        listed concurrently, with at most ``walk_concurrency`` listings in flight.
+        Only the directories left in ``dirs`` by the caller are descended into.
+
         Note that the "files" outputted will include anything that is not
         a directory, such as links.
 
@@ -849,49 +1316,91 @@ class AzureBlobFileSystem(AsyncFileSystem):
         **kwargs are passed to ``ls``
         """
         path = self._strip_protocol(path)
-        full_dirs = {}
-        dirs = {}
-        files = {}
+        depth = 0
+        level = [path]
+        while level:
+            next_level = []
+            for p, dirs, files, dir_paths in await self._walk_level(level, **kwargs):
+                yield p, dirs, files
+                next_level.extend(dir_paths[d] for d in dirs)
+            depth += 1
+            if maxdepth is not None and depth >= maxdepth:
+                return
+            level = next_level
 
-        detail = kwargs.pop("detail", False)
-        try:
-            listing = await self._ls(path, return_glob=True, **kwargs)
-        except (FileNotFoundError, IOError):
-            listing = []
-            # self._stop_iterating()
-            # yield [], [], []
-
-        for info in listing:
-            # each info name must be at least [path]/part , but here
-            # we check also for names like [path]/part/
-            pathname = info["name"].rstrip("/")
-            name = pathname.rsplit("/", 1)[-1]
-            if info["type"] == "directory" and pathname != path:
-                # do not include "self" path
-                full_dirs[pathname] = info
-                dirs[name] = info
-            elif pathname == path:
-                # file-like with same name as give path
-                files[""] = info
+    async def _walk_level(self, level, detail=False, **kwargs):
+        """
+        List the directories of one level of a walk concurrently
+
+        Returns
+        -------
+        list of (path, dirs, files, dir_paths) for each directory in level,
+        where dir_paths maps the name of each directory in dirs to its path
+        """
+        semaphore = asyncio.Semaphore(self.walk_concurrency)
+
+        async def _list(path):
+            async with semaphore:
+                try:
+                    return await self._ls(path, return_glob=True, **kwargs)
+                except (FileNotFoundError, IOError):
+                    return []
+
+        listings = await asyncio.gather(*[_list(p) for p in level])
+        out = []
+        for path, listing in zip(level, listings):
+            dirs = {}
+            files = {}
+            dir_paths = {}
+            for info in listing:
+                # each info name must be at least [path]/part , but here
+                # we check also for names like [path]/part/
+                pathname = info["name"].rstrip("/")
+                name = pathname.rsplit("/", 1)[-1]
+                if info["type"] == "directory" and pathname != path:
+                    # do not include "self" path
+                    dir_paths[name] = pathname
+                    dirs[name] = info
+                elif pathname == path:
+                    # file-like with same name as give path
+                    files[""] = info
+                else:
+                    files[name] = info
+
+            if detail:
+                for p, d, f in self._walk(path, dirs, files):
+                    out.append((p, d, f, dir_paths))
             else:
-                files[name] = info
+                out.append((path, list(dirs), list(files), dir_paths))
+        return out
 
-        if detail:
-            for p, d, f in self._walk(path, dirs, files):
-                yield p, d, f
-        else:
-            yield path, list(dirs), list(files)
+    def du(self, path, total=True, maxdepth=None, **kwargs):
+        return maybe_sync(self._du, self, path, total, maxdepth, **kwargs)
 
-        if maxdepth is not None:
-            maxdepth -= 1
-            if maxdepth < 1:
-                return
+    async def _du(self, path, total=True, maxdepth=None, **kwargs):
+        """Space used by files within a path
 
-        for d in full_dirs:
-            async for path, dirs, files in self._async_walk(
-                d, maxdepth=maxdepth, detail=detail, **kwargs
-            ):
-                yield path, dirs, files
+        Parameters
+        ----------
+        path: str
+        total: bool
+            whether to sum all the file sizes
+        maxdepth: int or None
+            maximum number of directory levels to descend, None for unlimited.
+        kwargs: passed to ``ls``
+
+        Returns
+        -------
+        Dict of {fn: size} if total=False, or int otherwise, where numbers
+        refer to bytes used.
+        """
+        files = await self._find_listing(path, maxdepth=maxdepth, **kwargs)
+        # a Listing stores an unknown size as -1
+        sizes = {name: max(size, 0) for name, size in zip(files.names, files.sizes)}
+        if total:
+            return sum(sizes.values())
+        else:
+            return sizes
 
     def mkdir(self, path, delimiter="/", exist_ok=False, **kwargs):
         maybe_sync(self._mkdir, self, path, delimiter, exist_ok)
@@ -949,12 +1458,20 @@ class AzureBlobFileSystem(AsyncFileSystem):
                     )
             except ResourceExistsError:
                 raise FileExistsError(f"{container_name_as_dir}{path} already exists!!")
-        self.invalidate_cache(self._parent(path))
+        self.invalidate_cache(f"{container_name}{delimiter}{path}".rstrip(delimiter))
 
     def rm(self, path, recursive=False, maxdepth=None, **kwargs):
-        maybe_sync(self._rm, self, path, recursive, **kwargs)
+        maybe_sync(self._rm, self, path, recursive, maxdepth, **kwargs)
 
-    async def _rm(self, path, recursive=False, maxdepth=None, **kwargs):
+    async def _rm(
+        self,
+        path,
+        recursive=False,
+        maxdepth=None,
+        delimiter="/",
+        max_concurrency=None,
+        **kwargs,
+    ):
         """Delete files.
         Parameters
         ----------
@@ -967,11 +1484,62 @@ class AzureBlobFileSystem(AsyncFileSystem):
             Depth to pass to walk for finding files to delete, if recursive.
             If None, there will be no limit and infinite recursion may be
             possible.
+        max_concurrency: int
+            The maximum number of batches of deletes to have in flight at once.
+            Overrides the filesystem's ``max_concurrency``
+
+        The blobs are deleted with the blob batch API, in batches of up to
+        ``BATCH_DELETE_SIZE``.  Expanded paths which turn out to be
+        directories have no blob of their own to delete, and are skipped;
+        containers are deleted once their blobs are gone.
         """
-        path = await self._expand_path(path, recursive=recursive, maxdepth=maxdepth)
-        for p in reversed(path):
-            await self.rm_file(p)
-        self.invalidate_cache()
+        paths = await self._expand_path(path, recursive=recursive, maxdepth=maxdepth)
+        blobs = {}
+        containers = []
+        for p in paths:
+            container_name, blob = self.split_path(p, delimiter=delimiter)
+            if blob:
+                blobs.setdefault(container_name, []).append(blob)
+            else:
+                containers.append(container_name)
+        batches = [
+            (container_name, names[i : i + BATCH_DELETE_SIZE])
+            for container_name, names in blobs.items()
+            for i in range(0, len(names), BATCH_DELETE_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _delete_batch(container_name, names):
+            container_client = self.service_client.get_container_client(
+                container=container_name
+            )
+            async with semaphore:
+                logging.debug(f"Delete {len(names)} blobs in {container_name}")
+                responses = await container_client.delete_blobs(
+                    *names, raise_on_any_failure=False
+                )
+                async for name, response in _azip(names, responses):
+                    # paths of directories have no blob, so are not found
+                    if response.status_code not in (202, 404):
+                        raise RuntimeError(
+                            f"Unable to delete {container_name}/{name}! "
+                            f"(status {response.status_code})"
+                        )
+
+        try:
+            await asyncio.gather(*[_delete_batch(*batch) for batch in batches])
+            for container_name in containers:
+                logging.debug(f"Delete container {container_name}")
+                try:
+                    await self.service_client.delete_container(container_name)
+                except ResourceNotFoundError:
+                    pass
+        finally:
+            for p in paths:
+                self.dircache.pop(p.rstrip(delimiter), None)
+                self.infocache.pop(p.rstrip(delimiter), None)
+            for parent in {self._parent(p) for p in paths}:
+                self.invalidate_cache(parent)
 
     async def rm_file(self, path, delimiter="/", **kwargs):
         """
@@ -989,25 +1557,25 @@ class AzureBlobFileSystem(AsyncFileSystem):
             kind = await self._info(path)
             kind = kind["type"]
             if kind == "file":
-                container_name, path = self.split_path(path, delimiter=delimiter)
+                container_name, blob = self.split_path(path, delimiter=delimiter)
                 container_client = self.service_client.get_container_client(
                     container=container_name
                 )
-                logging.debug(f"Delete blob {path} in {container_name}")
-                await container_client.delete_blob(path)
+                logging.debug(f"Delete blob {blob} in {container_name}")
+                await container_client.delete_blob(blob)
             elif kind == "directory":
-                container_name, path = self.split_path(path, delimiter=delimiter)
+                container_name, blob = self.split_path(path, delimiter=delimiter)
                 container_client = self.service_client.get_container_client(
                     container=container_name
                 )
                 _containers = await self._ls("")
                 _containers = [c["name"] for c in _containers]
-                if (container_name + delimiter in _containers) and (not path):
+                if (container_name + delimiter in _containers) and (not blob):
                     logging.debug(f"Delete container {container_name}")
                     await container_client.delete_container()
             else:
                 raise RuntimeError(f"Unable to delete {path}!")
-            self.invalidate_cache(self._parent(path))
+            self.invalidate_cache(path)
 
         except FileNotFoundError:
             pass
@@ -1035,7 +1603,7 @@ class AzureBlobFileSystem(AsyncFileSystem):
         if (container_name + delimiter in _containers) and (not path):
             # delete container
             await self.service_client.delete_container(container_name)
-            self.invalidate_cache(self._parent(path))
+            self.invalidate_cache(container_name)
 
     def size(self, path):
         return maybe_sync(self._size, self, path)
@@ -1046,20 +1614,56 @@ class AzureBlobFileSystem(AsyncFileSystem):
         size = res.get("size", None)
         return size
 
+    def ukey(self, path):
+        return maybe_sync(self._ukey, self, path)
+
+    async def _ukey(self, path):
+        """
+        Hash of the file's etag, which changes whenever the blob does
+
+        Uses the cached listings where possible, so tokenizing many files
+        does not need a request per file
+        """
+        info = await self._info(path)
+        if "etag" not in info:
+            return tokenize(info)
+        return tokenize(info["name"], info["etag"])
+
+    def checksum(self, path):
+        return maybe_sync(self._checksum, self, path)
+
+    async def _checksum(self, path):
+        """Unique value for the current version of the file"""
+        return int(await self._ukey(path), 16)
+
+    def modified(self, path):
+        return maybe_sync(self._modified, self, path)
+
+    async def _modified(self, path):
+        """Return the last modified time of the file as a datetime.datetime"""
+        info = await self._info(path)
+        if info["type"] == "directory":
+            raise IsADirectoryError(path)
+        return info.get("last_modified")
+
+    def created(self, path):
+        return maybe_sync(self._created, self, path)
+
+    async def _created(self, path):
+        """Return the creation time of the file as a datetime.datetime"""
+        info = await self._info(path)
+        if info["type"] == "directory":
+            raise IsADirectoryError(path)
+        if "creation_time" not in info:
+            # files recorded from an upload response have no creation time
+            info = await self._info(path, refresh=True)
+        return info.get("creation_time")
+
     def isfile(self, path):
         return maybe_sync(self._isfile, self, path)
 
     async def _isfile(self, path):
         """Is this entry file-like?"""
-        try:
-            path_ = path.split("/")[:-1]
-            path_ = "/".join([p for p in path_])
-            if self.dircache[path_]:
-                for fp in self.dircache[path_]:
-                    if fp["name"] == path and fp["type"] == "file":
-                        return True
-        except KeyError:
-            pass
         try:
             info = await self._info(path)
             return info["type"] == "file"
@@ -1071,13 +1675,6 @@ class AzureBlobFileSystem(AsyncFileSystem):
 
     async def _isdir(self, path):
         """Is this entry directory-like?"""
-
-        if path in self.dircache:
-            for fp in self.dircache[path]:
-                # Files will contain themselves in the cache, but
-                # a directory can not contain itself
-                if fp["name"] != path:
-                    return True
         try:
             info = await self._info(path)
             return info["type"] == "directory"
@@ -1089,11 +1686,6 @@ class AzureBlobFileSystem(AsyncFileSystem):
 
     async def _exists(self, path):
         """Is there a file at the given path"""
-        try:
-            if self._ls_from_cache(path):
-                return True
-        except FileNotFoundError:
-            pass
         try:
             await self._info(path)
             return True
@@ -1118,39 +1710,228 @@ class AzureBlobFileSystem(AsyncFileSystem):
             or isinstance(path, list)
             or paths[0] != self._strip_protocol(path)
         ):
-            out = {}
-            for path in paths:
-                try:
-                    out[path] = self.cat_file(path, **kwargs)
-                except Exception as e:
-                    if on_error == "raise":
-                        raise
-                    if on_error == "return":
-                        out[path] = e
-            return out
+            return maybe_sync(self._cat, self, paths, on_error=on_error, **kwargs)
         else:
             return self.cat_file(paths[0])
 
-    def expand_path(self, path, recursive=False, maxdepth=None):
-        return maybe_sync(self._expand_path, self, path, recursive, maxdepth)
+    async def _cat(self, paths, on_error="raise", max_concurrency=None, **kwargs):
+        """
+        Fetch the contents of many paths concurrently, with at most
+        ``max_concurrency`` requests in flight
 
-    async def _expand_path(self, path, recursive=False, maxdepth=None):
-        """Turn one or more globs or directories into a list of all matching files"""
-        if isinstance(path, str):
-            out = await self._expand_path([path], recursive, maxdepth)
-        else:
-            out = set()
-            path = [self._strip_protocol(p) for p in path]
-            for p in path:
-                if has_magic(p):
-                    bit = set(await self._glob(p))
-                    out |= bit
-                    if recursive:
-                        bit2 = set(await self._expand_path(p))
-                        out |= bit2
+        Returns
+        -------
+        dict of {path: contents}, following ``on_error`` as in ``cat``
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _cat_one(path):
+            async with semaphore:
+                return await self._cat_file(path, **kwargs)
+
+        results = await asyncio.gather(
+            *[_cat_one(path) for path in paths], return_exceptions=True
+        )
+        out = {}
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                if on_error == "raise":
+                    raise result
+                if on_error == "omit":
+                    continue
+            out[path] = result
+        return out
+
+    def cat_ranges(self, paths, starts, ends, **kwargs):
+        return maybe_sync(self._cat_ranges, self, paths, starts, ends, **kwargs)
+
+    async def _cat_ranges(
+        self,
+        paths,
+        starts,
+        ends,
+        max_gap=CAT_RANGES_MAX_GAP,
+        max_block=CAT_RANGES_MAX_BLOCK,
+        on_error="return",
+        max_concurrency=None,
+        **kwargs,
+    ):
+        """
+        Fetch many byte ranges, from one or more files
+
+        Ranges of the same file which overlap, or are separated by no more than
+        ``max_gap`` bytes, are merged into a single request for up to
+        ``max_block`` bytes.  The merged requests are made concurrently, with
+        at most ``max_concurrency`` in flight, and each range is then sliced
+        out of the data for its request.
+
+        Parameters
+        ----------
+        paths: list of str
+            Path to an Azure Blob for each range
+
+        starts, ends: list of int
+            The start and end offset of each range, which may be negative or
+            None as in ``cat_file``
+
+        max_gap: int
+            The largest gap, in bytes, between ranges which are fetched together
+
+        max_block: int
+            The largest number of bytes fetched by a single merged request
+
+        on_error: "return" or "raise"
+            If "return", the exception for a range which could not be fetched is
+            given in its place.  If "raise", it is raised
+
+        Returns
+        -------
+        list of bytes
+            The bytes of each range, in the same order as the ranges.  Each is
+            its own copy, so that the merged data is not kept alive by it
+        """
+        if not len(paths) == len(starts) == len(ends):
+            raise ValueError("paths, starts and ends must have the same length")
+        paths = [self._strip_protocol(path) for path in paths]
+        starts = [0 if start is None else start for start in starts]
+        ends = list(ends)
+        unsized = sorted(
+            {
+                path
+                for path, start, end in zip(paths, starts, ends)
+                if start < 0 or end is None or end < 0
+            }
+        )
+        sizes = {}
+        if unsized:
+            infos = await self._info_many(unsized, on_error="return")
+            sizes = {
+                path: info if isinstance(info, Exception) else info["size"]
+                for path, info in zip(unsized, infos)
+            }
+        results = [None] * len(paths)
+        by_path = {}
+        for i, path in enumerate(paths):
+            size = sizes.get(path)
+            if isinstance(size, Exception):
+                results[i] = size
+                continue
+            if starts[i] < 0:
+                starts[i] = max(starts[i] + size, 0)
+            if ends[i] is None:
+                ends[i] = size
+            elif ends[i] < 0:
+                ends[i] = max(ends[i] + size, 0)
+            by_path.setdefault(path, []).append(i)
+
+        # (path, start, end, indices of the ranges within it)
+        spans = []
+        for path, indices in by_path.items():
+            indices.sort(key=starts.__getitem__)
+            for i in indices:
+                if spans and spans[-1][0] == path:
+                    _, span_start, span_end, span_indices = spans[-1]
+                    end = max(span_end, ends[i])
+                    if (
+                        starts[i] - span_end <= max_gap
+                        and end - span_start <= max_block
+                    ):
+                        spans[-1] = (path, span_start, end, span_indices + [i])
+                        continue
+                spans.append((path, starts[i], ends[i], [i]))
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _fetch(path, start, end, indices):
+            async with semaphore:
+                try:
+                    data = memoryview(await self._cat_file(path, start, end))
+                except Exception as e:
+                    for i in indices:
+                        results[i] = e
+                    return
+            for i in indices:
+                results[i] = bytes(
+                    data[max(starts[i] - start, 0) : max(ends[i] - start, 0)]
+                )
+
+        await asyncio.gather(*[_fetch(*span) for span in spans])
+        if on_error == "raise":
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        return maybe_sync(self._cat_file, self, path, start=start, end=end, **kwargs)
+
+    async def _cat_file(self, path, start=None, end=None, delimiter="/", **kwargs):
+        """
+        Get the content of a file, or of the bytes from start to end of it
+
+        Parameters
+        ----------
+        path: str
+            Path to an Azure Blob with its container name
+
+        start, end: int
+            Byte offsets of the range to fetch, which may be negative to count
+            back from the end of the file, as in a slice.  If None, the range
+            runs from the start, or to the end, of the file
+
+        delimiter: str
+            Delimiter used to split paths
+        """
+        path = self._strip_protocol(path)
+        if (start or 0) < 0 or (end or 0) < 0:
+            size = await self._size(path)
+            if start is not None and start < 0:
+                start = max(start + size, 0)
+            if end is not None and end < 0:
+                end = max(end + size, 0)
+        offset = start or 0
+        length = None
+        if end is not None:
+            length = end - offset
+            if length <= 0:
+                return b""
+        container_name, blob = self.split_path(path, delimiter=delimiter)
+        cc = self.service_client.get_container_client(container_name)
+        bc = cc.get_blob_client(blob=blob)
+        try:
+            stream = await bc.download_blob(offset=offset, length=length)
+        except ResourceNotFoundError as e:
+            if await self._isdir(path):
+                # directories read as empty, as they do when opened
+                return b""
+            raise FileNotFoundError(f"File not found for {e}")
+        except HttpResponseError as e:
+            if e.status_code == 416:
+                # the range starts beyond the end of the file
+                return b""
+            raise
+        return await stream.readall()
+
+    def expand_path(self, path, recursive=False, maxdepth=None):
+        return maybe_sync(self._expand_path, self, path, recursive, maxdepth)
+
+    async def _expand_path(self, path, recursive=False, maxdepth=None):
+        """Turn one or more globs or directories into a list of all matching files"""
+        if isinstance(path, str):
+            out = await self._expand_path([path], recursive, maxdepth)
+        else:
+            out = set()
+            path = [self._strip_protocol(p) for p in path]
+            for p in path:
+                if has_magic(p):
+                    bit = set(await self._glob(p))
+                    out |= bit
+                    if recursive:
+                        bit2 = set(await self._expand_path(p))
+                        out |= bit2
                     continue
                 elif recursive:
-                    rec = set(await self._find(p, withdirs=True))
+                    rec = set(await self._find(p, maxdepth=maxdepth, withdirs=True))
                     out |= rec
                 if p not in out and (recursive is False or await self._exists(p)):
                     # only check once for root
@@ -1168,30 +1949,197 @@ class AzureBlobFileSystem(AsyncFileSystem):
         :param delimitier: Filepath delimiter
         :param overwrite: Boolean (False).  If True, overwrite the existing file present
         """
+        if os.path.isdir(lpath):
+            # Directories in blob storage are implied by the blobs within them
+            return
+        size, response = await self._upload_file(
+            lpath,
+            rpath,
+            delimiter=delimiter,
+            overwrite=overwrite,
+            max_concurrency=kwargws.get("max_concurrency"),
+        )
+        self._cache_written_file(rpath, size, response)
 
+    async def _upload_file(
+        self,
+        lpath,
+        rpath,
+        delimiter="/",
+        overwrite=False,
+        max_concurrency=None,
+        semaphore=None,
+        **kwargs,
+    ):
+        """
+        Upload the local file at lpath to rpath, without updating the cache
+
+        Files larger than the filesystem's ``blocksize`` are staged as blocks,
+        up to ``max_concurrency`` at a time, and committed once all of them
+        have been staged.  A ``semaphore`` shared between files bounds the
+        blocks in flight, and so in memory, across all of them instead.
+
+        Returns
+        -------
+        The size of the file, and the properties returned by the upload
+        """
         container_name, path = self.split_path(rpath, delimiter=delimiter)
         cc = self.service_client.get_container_client(container_name)
         bc = cc.get_blob_client(blob=path)
-        if os.path.isdir(lpath):
-            self.makedirs(rpath, exist_ok=True)
-        else:
-            try:
-                with open(lpath, "rb") as f1:
-                    await bc.upload_blob(f1, overwrite=overwrite)
-                self.invalidate_cache()
-            except ResourceExistsError:
-                raise FileExistsError("File already exists!!")
-            except ResourceNotFoundError:
-                if not await self._exists(container_name):
-                    raise FileNotFoundError("Container does not exist.")
-                await self._put_file(lpath, rpath, delimiter, overwrite)
-                self.invalidate_cache()
+        try:
+            with open(lpath, "rb") as f1:
+                size = os.fstat(f1.fileno()).st_size
+                if size <= self.blocksize:
+                    response = await bc.upload_blob(f1, overwrite=overwrite)
+                else:
+                    if semaphore is None:
+                        semaphore = asyncio.Semaphore(
+                            max_concurrency or self.max_concurrency
+                        )
+                    response = await self._upload_blocks(
+                        bc, f1, size, overwrite, semaphore
+                    )
+        except (ResourceExistsError, ResourceModifiedError):
+            raise FileExistsError("File already exists!!")
+        except ResourceNotFoundError:
+            if not await self._exists(container_name):
+                raise FileNotFoundError("Container does not exist.")
+            return await self._upload_file(
+                lpath, rpath, delimiter, overwrite, max_concurrency, semaphore
+            )
+        return size, response
+
+    async def _upload_blocks(self, blob_client, f, size, overwrite, semaphore):
+        """
+        Upload the open local file f as a block blob, staging its blocks
+        concurrently
+
+        The block size is the filesystem's ``blocksize``, or larger if needed to
+        keep the file within the number of blocks a blob may have.  Each block
+        is read, off the loop, and staged while holding the semaphore.
+
+        Returns
+        -------
+        The properties returned by the block list commit
+        """
+        block_size = max(self.blocksize, -(-size // MAX_BLOCKS_PER_BLOB))
+        block_ids = [f"{i:07d}" for i in range(-(-size // block_size))]
+        loop = asyncio.get_event_loop()
+        lock = threading.Lock()
+        reads = []
+
+        async def _stage(i, block_id):
+            async with semaphore:
+                # a read outlives the cancelling of its task, so it is
+                # waited for below, before the caller closes f
+                read = loop.run_in_executor(
+                    None, _read_at, f, block_size, i * block_size, lock
+                )
+                reads.append(read)
+                data = await asyncio.shield(read)
+                await blob_client.stage_block(
+                    block_id=block_id, data=data, length=len(data)
+                )
+
+        try:
+            await _gather_or_cancel([_stage(*block) for block in enumerate(block_ids)])
+        except BaseException:
+            await asyncio.gather(*reads, return_exceptions=True)
+            raise
+        response = await blob_client.commit_block_list(
+            [BlobBlock(block_id) for block_id in block_ids],
+            match_condition=None if overwrite else MatchConditions.IfMissing,
+        )
+        # the Content-MD5 of a commit is that of the block list, not of the blob
+        response["content_md5"] = None
+        return response
 
     put_file = sync_wrapper(_put_file)
 
-    async def _cp_file(self, path1, path2, *kwargs):
-        """ Copy the file at path1 to path2 """
-        # import pdb;pdb.set_trace()
+    async def _put(self, lpaths, rpaths, max_concurrency=None, **kwargs):
+        """
+        Copy many local files to remote
+
+        The files are uploaded concurrently, and each is recorded in the cached
+        listings above it once it is written, as by ``put_file``.  Local
+        directories need no upload, since directories in blob storage are
+        implied by the blobs within them.
+
+        Parameters
+        ----------
+        lpaths: list of str
+            Paths to local files and directories, as expanded by ``put``
+
+        rpaths: list of str
+            The remote paths to copy each of them to
+
+        max_concurrency: int
+            The maximum number of files to upload at once, and of blocks in
+            flight across them.  Overrides the filesystem's ``max_concurrency``
+        """
+        files = [
+            (lpath, rpath)
+            for lpath, rpath in zip(lpaths, rpaths)
+            if not os.path.isdir(lpath)
+        ]
+        max_concurrency = max_concurrency or self.max_concurrency
+        # one pool bounds the files open at once, and another the blocks
+        files_semaphore = asyncio.Semaphore(max_concurrency)
+        blocks_semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _put_one(lpath, rpath):
+            async with files_semaphore:
+                try:
+                    size, response = await self._upload_file(
+                        lpath, rpath, semaphore=blocks_semaphore, **kwargs
+                    )
+                except BaseException:
+                    # the blob may or may not have been written
+                    self.invalidate_cache(rpath)
+                    raise
+            self._cache_written_file(rpath, size, response)
+
+        await _gather_or_cancel([_put_one(lpath, rpath) for lpath, rpath in files])
+
+    async def _cp_file(
+        self,
+        path1,
+        path2,
+        block_copy=False,
+        block_size=COPY_BLOCK_SIZE,
+        max_concurrency=None,
+        **kwargs,
+    ):
+        """
+        Copy the file at path1 to path2
+
+        The copy is made by Azure, without the data passing through the
+        client, and this waits for it to complete.
+
+        Parameters
+        ----------
+        path1: str
+            Path to the Azure Blob to copy, with its container name
+
+        path2: str
+            Path to copy it to
+
+        block_copy: bool (False)
+            If False, Azure copies the blob in the background, and its status
+            is polled until the copy is done.  If True, the blob is split into
+            ranges, each of which is staged as a block of the new blob with
+            ``stage_block_from_url``, and the blocks are then committed.  This
+            runs at a predictable rate for very large blobs
+
+        block_size: int
+            The size of the ranges staged with ``block_copy``.  Defaults to
+            ``COPY_BLOCK_SIZE``, the largest Azure allows, since the data is
+            copied by Azure and never held by the client
+
+        max_concurrency: int
+            The maximum number of blocks to stage at once with ``block_copy``.
+            Overrides the filesystem's ``max_concurrency``
+        """
         container1, path1 = self.split_path(path1, delimiter="/")
         container2, path2 = self.split_path(path2, delimiter="/")
 
@@ -1202,12 +2150,177 @@ class AzureBlobFileSystem(AsyncFileSystem):
         else:
             cc2 = self.service_client.get_container_client(container2)
             blobclient2 = cc2.get_blob_client(blob=path2)
-        await blobclient2.start_copy_from_url(blobclient1.url)
-        self.invalidate_cache(container1)
-        self.invalidate_cache(container2)
+        try:
+            if block_copy:
+                info = await self._info(f"{container1}/{path1}", refresh=True)
+                await self._copy_blocks(
+                    blobclient1,
+                    blobclient2,
+                    info["size"],
+                    etag=info.get("etag"),
+                    block_size=block_size,
+                    max_concurrency=max_concurrency,
+                )
+                return
+            copy = await blobclient2.start_copy_from_url(blobclient1.url)
+            status = copy["copy_status"]
+            delay = COPY_POLL_INTERVAL
+            while status == "pending":
+                # copies between accounts, or of large blobs, carry on in the
+                # background on Azure
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_COPY_POLL_INTERVAL)
+                properties = await blobclient2.get_blob_properties()
+                status = properties.copy.status
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"{container1}/{path1} does not exist")
+        finally:
+            self.invalidate_cache(f"{container2}/{path2}")
+        if status != "success":
+            raise RuntimeError(
+                f"Unable to copy {container1}/{path1} to {container2}/{path2}! "
+                f"(copy status {status})"
+            )
 
     cp_file = sync_wrapper(_cp_file)
 
+    async def _copy_blocks(
+        self,
+        source_client,
+        blob_client,
+        size,
+        etag=None,
+        block_size=COPY_BLOCK_SIZE,
+        max_concurrency=None,
+    ):
+        """
+        Copy the blob of source_client to blob_client by staging its ranges as
+        blocks concurrently, then committing them
+
+        The ranges are block_size bytes, or larger if needed to keep the blob
+        within the number of blocks a blob may have.  Given the etag of the
+        source, blocks are only staged from that version of it, and an
+        OSError is raised once it has changed.
+
+        Returns
+        -------
+        The properties returned by the block list commit
+        """
+        source_url = self._source_url(source_client)
+        block_size = max(block_size, -(-size // MAX_BLOCKS_PER_BLOB))
+        block_ids = [f"{i:07d}" for i in range(-(-size // block_size))]
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        if etag is None:
+            conditions = {}
+        else:
+            conditions = {
+                "source_modified_access_conditions": SourceModifiedAccessConditions(
+                    source_if_match=etag
+                )
+            }
+
+        async def _stage(i, block_id):
+            offset = i * block_size
+            async with semaphore:
+                try:
+                    await blob_client.stage_block_from_url(
+                        block_id=block_id,
+                        source_url=source_url,
+                        source_offset=offset,
+                        source_length=min(block_size, size - offset),
+                        **conditions,
+                    )
+                except HttpResponseError as e:
+                    if e.status_code != 412:
+                        raise
+                    raise OSError(
+                        f"{source_client.container_name}/{source_client.blob_name}"
+                        " was modified while it was being copied"
+                    ) from None
+
+        await _gather_or_cancel([_stage(*block) for block in enumerate(block_ids)])
+        return await blob_client.commit_block_list(
+            [BlobBlock(block_id) for block_id in block_ids]
+        )
+
+    @staticmethod
+    def _source_url(blob_client):
+        """
+        URL from which Azure can read the blob of blob_client as the source of
+        a copy
+
+        Azure authorizes reads from such URLs only by a SAS token, so one is
+        generated when the client signs its requests with an account key.
+        """
+        credential = getattr(blob_client, "credential", None)
+        account_key = getattr(credential, "account_key", None)
+        if account_key is None:
+            return blob_client.url
+        sas_token = generate_blob_sas(
+            account_name=credential.account_name,
+            container_name=blob_client.container_name,
+            blob_name=blob_client.blob_name,
+            account_key=account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.utcnow() + timedelta(hours=1),
+        )
+        return f"{blob_client.url}?{sas_token}"
+
+    def copy(self, path1, path2, recursive=False, maxdepth=None, **kwargs):
+        paths = self.expand_path(path1, recursive=recursive, maxdepth=maxdepth)
+        path2 = other_paths(paths, path2)
+        maybe_sync(self._copy, self, paths, path2, **kwargs)
+
+    async def _copy(self, paths, path2, max_concurrency=None, **kwargs):
+        """
+        Copy many files within the filesystem
+
+        Each file is copied on Azure, with at most ``max_concurrency`` copies
+        in flight at once.  Directories are skipped, since they are implied by
+        the blobs within them.
+
+        Parameters
+        ----------
+        paths: list of str
+            Paths to copy, as expanded by ``copy``
+
+        path2: list of str
+            The paths to copy each of them to
+
+        max_concurrency: int
+            Overrides the filesystem's ``max_concurrency``
+        """
+        infos = await self._info_many(paths, max_concurrency=max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _copy_one(p1, p2):
+            async with semaphore:
+                await self._cp_file(p1, p2, **kwargs)
+
+        await _gather_or_cancel(
+            [
+                _copy_one(p1, p2)
+                for info, p1, p2 in zip(infos, paths, path2)
+                if info["type"] == "file"
+            ]
+        )
+
+    def mv(self, path1, path2, recursive=False, maxdepth=None, **kwargs):
+        """Move file(s) from one location to another"""
+        maybe_sync(self._mv, self, path1, path2, recursive, maxdepth, **kwargs)
+
+    async def _mv(self, path1, path2, recursive=False, maxdepth=None, **kwargs):
+        """
+        Move file(s) from one location to another
+
+        The files are copied on Azure, as in ``copy``, and the sources are then
+        deleted in batches, as in ``rm``.
+        """
+        paths = await self._expand_path(path1, recursive=recursive, maxdepth=maxdepth)
+        path2 = other_paths(paths, path2)
+        await self._copy(paths, path2, **kwargs)
+        await self._rm(paths, **kwargs)
+
     def upload(self, lpath, rpath, recursive=False, **kwargs):
         """Alias of :ref:`FilesystemSpec.put`."""
         return self.put(lpath, rpath, recursive=recursive, **kwargs)
@@ -1218,32 +2331,485 @@ class AzureBlobFileSystem(AsyncFileSystem):
 
     async def _get_file(self, rpath, lpath, recursive=False, delimiter="/", **kwargs):
         """ Copy single file remote to local """
-        files = await self._ls(rpath)
-        files = [f["name"] for f in files]
+        try:
+            info = await self._info(rpath)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"File not found for {e}")
+        if info["type"] == "directory":
+            os.makedirs(lpath, exist_ok=True)
+        else:
+            await self._download_file(
+                rpath,
+                lpath,
+                size=info["size"],
+                etag=info.get("etag"),
+                delimiter=delimiter,
+            )
+
+    get_file = sync_wrapper(_get_file)
+
+    async def _download_file(
+        self,
+        rpath,
+        lpath,
+        size=None,
+        etag=None,
+        semaphore=None,
+        delimiter="/",
+        **kwargs,
+    ):
+        """
+        Download the blob at rpath to the local file lpath
+
+        Blobs larger than the filesystem's ``blocksize`` are split into ranges
+        of that size, which are fetched concurrently and each written at its
+        own offset in the local file, so that only the ranges in flight are
+        ever held in memory.  Smaller blobs are streamed to the file with a
+        single request.  The blob is only fetched while it still has the etag
+        it had when its size was found, so that two versions are never mixed
+        in one file; if it has changed, its details are looked up again and
+        the download is tried once more.  If the download fails, the partly
+        written file is removed once the writes still running have finished.
+
+        Parameters
+        ----------
+        rpath: str
+            Path to the Azure Blob with its container name
+
+        lpath: str
+            Local path to write to
+
+        size: int
+            Size of the blob in bytes, if already known
+
+        etag: str
+            The etag of the blob of that size, if already known.  Without a
+            size, both are looked up
+
+        semaphore: asyncio.Semaphore
+            Bounds the number of requests in flight, and so the memory used, when
+            shared between several downloads.  Defaults to a new semaphore
+            allowing ``max_concurrency`` requests
+        """
         container_name, path = self.split_path(rpath, delimiter=delimiter)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        if size is None:
+            info = await self._info(rpath)
+            size, etag = info["size"], info.get("etag")
+        cc = self.service_client.get_container_client(container_name)
+        bc = cc.get_blob_client(blob=path)
         try:
-            cc = self.service_client.get_container_client(container_name)
-            bc = cc.get_blob_client(blob=path)
+            await self._download_blob(bc, lpath, size, etag, semaphore)
+        except ResourceModifiedError:
+            # the size and etag were stale, or the blob was overwritten while
+            # it was downloaded, so it is tried once more with fresh ones
+            info = await self._info(rpath, refresh=True)
+            try:
+                await self._download_blob(
+                    bc, lpath, info["size"], info.get("etag"), semaphore
+                )
+            except ResourceModifiedError:
+                raise OSError(
+                    f"{rpath} was modified while it was being downloaded"
+                ) from None
+        except ResourceNotFoundError as e:
+            raise FileNotFoundError(f"File not found for {e}")
 
-            if await self._isdir(rpath):
-                os.makedirs(lpath, exist_ok=True)
+    async def _download_blob(self, bc, lpath, size, etag, semaphore):
+        """Download the blob of a blob client to lpath, given its size and etag"""
+        if etag is None:
+            conditions = {}
+        else:
+            conditions = {
+                "etag": etag,
+                "match_condition": MatchConditions.IfNotModified,
+            }
+        loop = asyncio.get_event_loop()
+        lock = threading.Lock()
+        writes = []
+
+        async def _fetch_range(my_blob, offset):
+            length = min(self.blocksize, size - offset)
+            async with semaphore:
+                stream = await bc.download_blob(
+                    offset=offset, length=length, **conditions
+                )
+                data = await stream.readall()
+                # cancelling cannot stop the thread writing, so the write is
+                # shielded, to be waited for before the file is closed
+                write = loop.run_in_executor(
+                    None, _write_at, my_blob, data, offset, lock
+                )
+                writes.append(write)
+                await asyncio.shield(write)
+
+        with open(lpath, "wb") as my_blob:
+            try:
+                if size <= self.blocksize:
+                    async with semaphore:
+                        stream = await bc.download_blob(**conditions)
+                        await stream.readinto(my_blob)
+                else:
+                    my_blob.truncate(size)
+                    await _gather_or_cancel(
+                        [
+                            _fetch_range(my_blob, offset)
+                            for offset in range(0, size, self.blocksize)
+                        ]
+                    )
+            except BaseException:
+                await asyncio.gather(*writes, return_exceptions=True)
+                my_blob.close()
+                os.remove(lpath)
+                raise
+
+    def get(self, rpath, lpath, recursive=False, **kwargs):
+        """Copy file(s) to local
+
+        Copies a specific file or tree of files (if recursive=True). If lpath
+        ends with a "/", it will be assumed to be a directory, and target files
+        will go within.  The files are downloaded concurrently, with at most
+        ``max_concurrency`` downloads in flight.
+        """
+        rpath = self._strip_protocol(rpath)
+        lpath = make_path_posix(lpath)
+        rpaths = self.expand_path(rpath, recursive=recursive)
+        lpaths = other_paths(rpaths, lpath)
+        return maybe_sync(self._get, self, rpaths, lpaths, **kwargs)
+
+    async def _get(self, rpaths, lpaths, max_concurrency=None, **kwargs):
+        """
+        Copy many remote files to local
+
+        Whether each remote path is a file or a directory is taken from the
+        listing made when the paths were expanded, the local directories are
+        all created up front, and the files are then downloaded concurrently.
+        The ranges of large files are fetched through the same pool, so no more
+        than ``max_concurrency`` requests, of at most ``blocksize`` bytes each,
+        are in flight at once.
+
+        Parameters
+        ----------
+        rpaths: list of str
+            Paths to Azure Blobs and directories, as expanded by ``get``
+
+        lpaths: list of str
+            The local paths to copy each of them to
+
+        max_concurrency: int
+            The maximum number of files to download at once.  Overrides the
+            filesystem's ``max_concurrency``
+        """
+        infos = await self._info_many(rpaths, max_concurrency=max_concurrency)
+        files = []
+        local_dirs = set()
+        for info, rpath, lpath in zip(infos, rpaths, lpaths):
+            if info["type"] == "directory":
+                local_dirs.add(lpath)
             else:
-                with open(lpath, "wb") as my_blob:
-                    stream = await bc.download_blob()
-                    data = await stream.readall()
-                    my_blob.write(data)
-        except Exception as e:
-            raise FileNotFoundError(f"File not found for {e}")
+                files.append((rpath, lpath, info["size"], info.get("etag")))
+                local_dirs.add(os.path.dirname(lpath))
+        for local_dir in sorted(local_dirs):
+            if local_dir:
+                os.makedirs(local_dir, exist_ok=True)
+
+        max_concurrency = max_concurrency or self.max_concurrency
+        # one pool bounds the files open at once, and another the requests
+        files_semaphore = asyncio.Semaphore(max_concurrency)
+        requests_semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _get_one(rpath, lpath, size, etag):
+            async with files_semaphore:
+                await self._download_file(
+                    rpath,
+                    lpath,
+                    size=size,
+                    etag=etag,
+                    semaphore=requests_semaphore,
+                    **kwargs,
+                )
 
-    get_file = sync_wrapper(_get_file)
+        await _gather_or_cancel([_get_one(*file) for file in files])
+
+    def sync(
+        self,
+        src,
+        dst,
+        direction="upload",
+        delete=False,
+        checksum=False,
+        tolerance=1,
+        **kwargs,
+    ):
+        return maybe_sync(
+            self._sync,
+            self,
+            src,
+            dst,
+            direction=direction,
+            delete=delete,
+            checksum=checksum,
+            tolerance=tolerance,
+            **kwargs,
+        )
+
+    async def _sync(
+        self,
+        src,
+        dst,
+        direction="upload",
+        delete=False,
+        checksum=False,
+        tolerance=1,
+        max_concurrency=None,
+    ):
+        """
+        Bring dst up to date with src, transferring only the files which differ
+
+        One flat listing of the remote directory is compared with a scan of the
+        local directory.  A file is transferred if it is missing from dst, if
+        its size differs, or if the copy in src was modified more than
+        ``tolerance`` seconds after the copy in dst.  Downloaded files are
+        given the last modified time of their blob, so that they compare as
+        unchanged until the blob changes.
+
+        When uploading, the modified time of a local file is compared with the
+        time its blob was written, by the clock of the Azure service.  If that
+        clock may be ahead of or behind this machine's by more than
+        ``tolerance``, or files may change within ``tolerance`` of being
+        uploaded, use ``checksum=True``.
+
+        Parameters
+        ----------
+        src, dst: str
+            The directories to copy from and to.  One is local and the other a
+            remote path with its container name, depending on direction
+
+        direction: "upload" or "download"
+            Whether src is the local directory, and dst the remote one, or the
+            other way round
+
+        delete: bool (False)
+            If True, files in dst which are not in src are deleted, in batches
+            for remote files
+
+        checksum: bool (False)
+            If True, files of the same size are compared by the MD5 of their
+            contents, where Azure has one for the blob, rather than by their
+            modified times
+
+        tolerance: float (1)
+            The number of seconds by which the modified time in src must be
+            later than the one in dst for a file of the same size to be
+            transferred.  Azure keeps modified times to the second
+
+        max_concurrency: int
+            The maximum number of transfers to have in flight at once.
+            Overrides the filesystem's ``max_concurrency``
+
+        Returns
+        -------
+        dict with the lists of paths in dst which were "transferred" and
+        "deleted"
+
+        Raises
+        ------
+        FileNotFoundError if src does not exist, so that ``delete=True`` never
+        empties dst because of a missing or mistyped source
+        """
+        if direction == "upload":
+            local, remote = src, dst
+        elif direction == "download":
+            remote, local = src, dst
+        else:
+            raise ValueError(
+                f"direction must be 'upload' or 'download', not {direction}"
+            )
+        local = make_path_posix(local).rstrip("/")
+        remote = self._strip_protocol(remote).rstrip("/")
+        if direction == "upload" and not os.path.isdir(local):
+            raise FileNotFoundError(f"{src} is not a local directory")
+        if direction == "download":
+            try:
+                info = await self._info(remote)
+            except FileNotFoundError:
+                info = None
+            if info is None or info["type"] != "directory":
+                raise FileNotFoundError(f"{src} is not a remote directory")
+
+        remote_files = {}
+        for entry in await self._find_listing(remote):
+            if entry["name"].startswith(f"{remote}/"):
+                remote_files[entry["name"][len(remote) + 1 :]] = entry
+        local_files = {}
+        for root, _, names in os.walk(local):
+            for name in names:
+                lpath = os.path.join(root, name)
+                relpath = os.path.relpath(lpath, local).replace(os.sep, "/")
+                local_files[relpath] = os.stat(lpath)
+
+        # local files are only hashed if they could match their blob, and the
+        # hashing is done off the loop
+        hashed = [
+            relpath
+            for relpath, stat in local_files.items()
+            if checksum
+            and relpath in remote_files
+            and remote_files[relpath].get("content_md5")
+            and stat.st_size == remote_files[relpath]["size"]
+        ]
+        loop = asyncio.get_event_loop()
+        digests = await asyncio.gather(
+            *[
+                loop.run_in_executor(None, _md5, f"{local}/{relpath}")
+                for relpath in hashed
+            ]
+        )
+        local_md5s = dict(zip(hashed, digests))
+
+        def _differs(relpath):
+            stat = local_files[relpath]
+            entry = remote_files[relpath]
+            if stat.st_size != entry["size"]:
+                return True
+            if relpath in local_md5s:
+                return local_md5s[relpath] != entry["content_md5"]
+            modified = entry["last_modified"].timestamp()
+            if direction == "upload":
+                return stat.st_mtime > modified + tolerance
+            return modified > stat.st_mtime + tolerance
+
+        if direction == "upload":
+            sources, targets = local_files, remote_files
+        else:
+            sources, targets = remote_files, local_files
+        changed = sorted(
+            relpath
+            for relpath in sources
+            if relpath not in targets or _differs(relpath)
+        )
+        extraneous = sorted(set(targets) - set(sources)) if delete else []
+        lpaths = [f"{local}/{relpath}" for relpath in changed]
+        rpaths = [f"{remote}/{relpath}" for relpath in changed]
+
+        if direction == "upload":
+            await self._put(
+                lpaths, rpaths, overwrite=True, max_concurrency=max_concurrency
+            )
+            if extraneous:
+                await self._rm(
+                    [f"{remote}/{relpath}" for relpath in extraneous],
+                    max_concurrency=max_concurrency,
+                )
+            transferred = rpaths
+            deleted = [f"{remote}/{relpath}" for relpath in extraneous]
+        else:
+            await self._get(rpaths, lpaths, max_concurrency=max_concurrency)
+            for relpath, lpath in zip(changed, lpaths):
+                modified = remote_files[relpath]["last_modified"].timestamp()
+                os.utime(lpath, (modified, modified))
+            for relpath in extraneous:
+                os.remove(f"{local}/{relpath}")
+            transferred = lpaths
+            deleted = [f"{local}/{relpath}" for relpath in extraneous]
+        return {"transferred": transferred, "deleted": deleted}
 
     def invalidate_cache(self, path=None):
+        """
+        Discard the cached details of path and of everything below it, and the
+        cached listings of path and its parent directories
+
+        A change to path can add or remove directories all the way up to its
+        container, so the cached listings of every level above it are dropped,
+        while the listings of unrelated directories are kept.  If path is
+        None, the whole cache is cleared.
+        """
         if path is None:
             self.dircache.clear()
+            self.infocache.clear()
+            self.missing_paths.clear()
         else:
+            path = self._strip_protocol(path).rstrip("/")
             self.dircache.pop(path, None)
+            self.infocache.pop(path, None)
+            for name in [n for n in self.infocache if n.startswith(f"{path}/")]:
+                self.infocache.pop(name, None)
+            # Once something is written to path, it and all of its parents exist
+            parent = path
+            while parent:
+                self.missing_paths.pop(parent, None)
+                parent = self._parent(parent)
+                self.dircache.pop(parent, None)
         super(AzureBlobFileSystem, self).invalidate_cache(path)
 
+    def _cache_written_file(self, path: str, size: int, response, delimiter="/"):
+        """
+        Record a newly written block blob in the cached listings above it
+
+        Rather than discarding these listings, the file, and any directories
+        leading to it, are inserted in place into the ones already in the
+        cache, using the etag and last_modified of the upload response, so
+        that listing the directory afterwards costs no request.
+
+        Parameters
+        ----------
+        path: str
+            Path to the blob with its container name
+
+        size: int
+            Size of the blob in bytes
+
+        response: dict
+            The properties returned by the upload, or the block list commit,
+            whose ``content_md5``, if any, is that of the blob
+        """
+        path = self._strip_protocol(path).rstrip(delimiter)
+        content_md5 = response.get("content_md5")
+        row = (
+            path,
+            size,
+            "file",
+            response.get("etag"),
+            response.get("last_modified"),
+            None,
+            bytes(content_md5).hex() if content_md5 else None,
+            BlobType.BlockBlob.value,
+        )
+        self.dircache.pop(path, None)
+        self.infocache.pop(path, None)
+        while True:
+            self.missing_paths.pop(path, None)
+            parent = self._parent(path)
+            if delimiter not in path:
+                # writing a blob never changes the list of containers
+                break
+            if parent in self.dircache and not self._is_file_listing(parent):
+                self.dircache[parent].put(row)
+            elif parent in self.dircache or self._is_new_directory(parent):
+                # there was nothing below parent, so this is all it holds
+                self.dircache[parent] = Listing([row])
+            path = parent
+            row = (f"{parent}{delimiter}", 0, "directory")
+
+    def _is_file_listing(self, path: str):
+        """
+        Whether the cached listing of path is that of a blob at path, with
+        nothing below it, rather than that of a directory
+        """
+        return self.dircache[path].get(path) is not None
+
+    def _is_new_directory(self, path: str):
+        """
+        Whether the cached listing of the parent of path shows that path did
+        not exist until now
+        """
+        try:
+            listing = self.dircache[self._parent(path)]
+        except KeyError:
+            return False
+        return self.split_path(path)[1] != "" and listing.get(path) is None
+
     def _open(
         self,
         path: str,
@@ -1275,6 +2841,10 @@ class AzureBlobFileSystem(AsyncFileSystem):
             Caching policy in read mode.
             See the definitions here:
             https://filesystem-spec.readthedocs.io/en/latest/api.html#readbuffering
+
+        kwargs: dict
+            Passed to AzureBlobFile, such as ``size`` or ``details`` of a blob
+            which is already known, to open it for reading without looking it up
         """
         logging.debug(f"_open:  {path}")
         return AzureBlobFile(
@@ -1293,6 +2863,7 @@ class AzureBlobFile(io.IOBase):
     """ File-like operations on Azure Blobs """
 
     DEFAULT_BLOCK_SIZE = 5 * 2 ** 20
+    DEFAULT_MAX_CONCURRENCY = 4
 
     def __init__(
         self,
@@ -1303,6 +2874,9 @@ class AzureBlobFile(io.IOBase):
         autocommit: bool = True,
         cache_type: str = "readahead",
         cache_options: dict = {},
+        max_concurrency: int = None,
+        size: int = None,
+        details: dict = None,
         **kwargs,
     ):
         """
@@ -1334,6 +2908,20 @@ class AzureBlobFile(io.IOBase):
             Additional options passed to the constructor for the cache specified
             by `cache_type`.
 
+        max_concurrency: int
+            In write mode, the number of blocks which may be staged in the
+            background at once, before further writes wait for one of them
+            to finish. Defaults to ``DEFAULT_MAX_CONCURRENCY``
+
+        size: int
+            In read mode, the size of the blob, if it is already known
+
+        details: dict
+            In read mode, the details of the blob, as given by ``ls`` or
+            ``find`` with ``detail=True``, if they are already known.  Without
+            these or ``size``, the details are taken from the filesystem's
+            cached listings, or requested if they are not cached
+
         kwargs: dict
             Passed to AbstractBufferedFile
         """
@@ -1347,12 +2935,10 @@ class AzureBlobFile(io.IOBase):
         self.container_name = container_name
         self.blob = blob
         self.block_size = block_size
-        # self.container_client = fs.service_client.get_container_client(
-        #     self.container_name
-        # )
         self.blocksize = (
             self.DEFAULT_BLOCK_SIZE if block_size in ["default", None] else block_size
         )
+        self.max_concurrency = max_concurrency or self.DEFAULT_MAX_CONCURRENCY
         self.loc = 0
         self.autocommit = autocommit
         self.end = None
@@ -1375,53 +2961,39 @@ class AzureBlobFile(io.IOBase):
         if self.mode not in {"ab", "rb", "wb"}:
             raise NotImplementedError("File mode not supported")
         if self.mode == "rb":
-            if not hasattr(self, "details"):
+            if details is not None and details.get("size") is not None:
+                self.details = details
+            elif size is not None:
+                self.details = {"name": self.path, "size": size, "type": "file"}
+            elif not hasattr(self, "details"):
                 self.details = self.fs.info(self.path)
             self.size = self.details["size"]
+            # Bytes asked of, and returned by, the service in range reads
+            self.bytes_requested = 0
+            self.bytes_received = 0
             self.cache = caches[cache_type](
                 self.blocksize, self._fetch_range, self.size, **cache_options
             )
         else:
-            self.buffer = io.BytesIO()
+            # Writes are copied into a block sized buffer, which is sent as a
+            # memoryview and reused once its upload is done
+            self.buffer = bytearray(self.blocksize)
+            self.buffered = 0
+            self._free_buffers = []
             self.offset = None
             self.forced = False
             self.location = None
+            self._commit_response = None
 
     def connect_client(self):
-        """Connect to the Synchronous BlobServiceClient, using user-specified connection details.
-        Tries credentials first, then connection string and finally account key
-
-        Raises
-        ------
-        ValueError if none of the connection details are available
+        """Connect to the container through the filesystem's asynchronous
+        BlobServiceClient, so that files share its connection pool and
+        credentials, and run their requests on the filesystem's loop
         """
-        try:
-            self.fs.account_url: str = (
-                f"https://{self.fs.account_name}.blob.core.windows.net"
-            )
-            if self.fs.sync_credential is not None:
-                self.container_client = BlobServiceClient(
-                    account_url=self.fs.account_url, credential=self.fs.sync_credential
-                ).get_container_client(self.container_name)
-            elif self.fs.connection_string is not None:
-                self.container_client = BlobServiceClient.from_connection_string(
-                    conn_str=self.fs.connection_string
-                ).get_container_client(self.container_name)
-            elif self.fs.account_key is not None:
-                self.container_client = BlobServiceClient(
-                    account_url=self.fs.account_url, credential=self.fs.account_key
-                ).get_container_client(self.container_name)
-            elif self.fs.sas_token is not None:
-                self.container_client = BlobServiceClient(
-                    account_url=self.fs.account_url + self.fs.sas_token, credential=None
-                ).get_container_client(self.container_name)
-            else:
-                self.container_client = BlobServiceClient(
-                    account_url=self.fs.account_url
-                ).get_container_client(self.container_name)
-
-        except Exception as e:
-            raise ValueError(f"Unable to connect with provided params for {e}!!")
+        self.loop = self.fs.loop
+        self.container_client = self.fs.service_client.get_container_client(
+            self.container_name
+        )
 
     @property
     def closed(self):
@@ -1476,51 +3048,75 @@ class AzureBlobFile(io.IOBase):
         return self.loc
 
     def discard(self):
-        """Throw away temporary file"""
+        """Throw away temporary file
+
+        In write mode, blocks still being staged are cancelled, and nothing
+        more is written, even when the file is closed
+        """
+        if self.mode in {"wb", "ab"} and not self.closed:
+            if getattr(self, "_staging", None):
+                self._discard_blocks()
+            self.forced = True
 
-    def _fetch_range(self, start: int, end: int, **kwargs):
+    async def _async_fetch_range(self, start: int, end: int, **kwargs):
         """
         Download a chunk of data specified by start and end
 
+        Exactly the bytes from start up to end, or the end of the blob, are
+        requested, and counted in ``bytes_requested`` and ``bytes_received``
+
         Parameters
         ----------
         start: int
             Start byte position to download blob from
         end: int
-            End byte position to download blob from
+            End byte position (exclusive) to download blob from
         """
-        blob = self.container_client.download_blob(
-            blob=self.blob, offset=start, length=end
+        end = min(end, self.size)
+        if start >= end:
+            return b""
+        length = end - start
+        self.bytes_requested += length
+        blob = await self.container_client.download_blob(
+            blob=self.blob, offset=start, length=length
         )
-        return blob.readall()
+        data = await blob.readall()
+        self.bytes_received += len(data)
+        return data
 
-    def __initiate_upload(self, **kwargs):
-        pass
+    _fetch_range = sync_wrapper(_async_fetch_range)
 
-    def _initiate_upload(self, **kwargs):
+    async def _async_initiate_upload(self, **kwargs):
         """Prepare a remote file upload"""
         self._block_list = []
+        self._commit_response = None
         if self.mode == "wb":
             self.blob_client = self.container_client.get_blob_client(blob=self.blob)
-            try:
-                self.container_client.delete_blob(self.blob)
-            except ResourceNotFoundError:
-                pass
-            else:
-                return self.__initiate_upload()
+            self._staging = deque()
         elif self.mode == "ab":
             self.blob_client = self.container_client.get_blob_client(blob=self.blob)
-            if not self.fs.exists(self.path):
-                self.blob_client.create_append_blob()
+            if not await self.fs._exists(self.path):
+                await self.blob_client.create_append_blob()
         else:
             raise ValueError(
                 "File operation modes other than wb are not yet supported for writing"
             )
 
-    def _upload_chunk(self, final: bool = False, **kwargs):
+    _initiate_upload = sync_wrapper(_async_initiate_upload)
+
+    async def _async_upload_chunk(self, final: bool = False, **kwargs):
         """
         Write one part of a multi-block file upload
 
+        In "wb" mode, a file which never filled a block is sent with a single
+        ``upload_blob`` when it is closed.  Otherwise, the block is staged by
+        a task on the filesystem's loop, so that writing can carry on while it
+        is sent.  Once ``max_concurrency`` blocks are in flight, this waits for
+        the oldest of them to finish.  The final call waits for every block
+        before committing the block list, which replaces any existing blob.
+        Each block in flight keeps its buffer until it has been staged, while
+        writing carries on into a free one.
+
         Parameters
         ----------
         final: bool
@@ -1528,33 +3124,82 @@ class AzureBlobFile(io.IOBase):
             self.autocommit is True.
 
         """
-        data = self.buffer.getvalue()
+        data = memoryview(self.buffer)[: self.buffered]
         length = len(data)
         block_id = len(self._block_list)
         block_id = f"{block_id:07d}"
         if self.mode == "wb":
-            try:
-                self.blob_client.stage_block(
-                    block_id=block_id, data=data, length=length
+            if final and not self._block_list:
+                try:
+                    # upload_blob only takes bytes, streams or iterables
+                    self._commit_response = await self.blob_client.upload_blob(
+                        data=bytes(data), length=length, overwrite=True
+                    )
+                except Exception as e:
+                    raise RuntimeError(f"Failed to upload block with {e}!!")
+                return
+            if length:
+                await self._async_wait_for_blocks(self.max_concurrency - 1)
+                task = asyncio.ensure_future(
+                    self.blob_client.stage_block(
+                        block_id=block_id, data=data, length=length
+                    )
                 )
+                self._staging.append((task, self.buffer))
                 self._block_list.append(block_id)
-
-                if final:
-                    block_list = [BlobBlock(_id) for _id in self._block_list]
-                    self.blob_client.commit_block_list(block_list=block_list)
-            except Exception as e:
-                # This step handles the situation where data="" and length=0
-                # which is throws an InvalidHeader error from Azure, so instead
-                # of staging a block, we directly upload the empty blob
-                if block_id == "0000000" and length == 0 and final:
-                    self.blob_client.upload_blob(data=data)
-                else:
+                self.buffer = (
+                    self._free_buffers.pop()
+                    if self._free_buffers
+                    else bytearray(self.blocksize)
+                )
+            if final:
+                await self._async_wait_for_blocks()
+                block_list = [BlobBlock(_id) for _id in self._block_list]
+                try:
+                    self._commit_response = await self.blob_client.commit_block_list(
+                        block_list=block_list
+                    )
+                    # the Content-MD5 of a commit is that of the block list
+                    self._commit_response["content_md5"] = None
+                except Exception as e:
                     raise RuntimeError(f"Failed to upload block with {e}!!")
         elif self.mode == "ab":
-            self.blob_client.upload_blob(
-                data=data, length=length, blob_type=BlobType.AppendBlob
+            await self.blob_client.upload_blob(
+                data=bytes(data), length=length, blob_type=BlobType.AppendBlob
             )
 
+    _upload_chunk = sync_wrapper(_async_upload_chunk)
+
+    async def _async_wait_for_blocks(self, limit: int = 0):
+        """
+        Wait until at most ``limit`` blocks are still being staged
+
+        The buffers of finished blocks are returned to the free buffers.  If
+        any of them failed, the blocks still in flight are discarded and the
+        error is raised as a RuntimeError
+        """
+        while len(self._staging) > limit:
+            task, buffer = self._staging.popleft()
+            try:
+                await task
+            except Exception as e:
+                await self._async_discard_blocks()
+                raise RuntimeError(f"Failed to upload block with {e}!!")
+            self._free_buffers.append(buffer)
+
+    async def _async_discard_blocks(self):
+        """
+        Cancel the blocks still being staged, and wait for all of them to
+        settle, so that none is left running or with an unretrieved error
+        """
+        tasks = [task for task, _ in self._staging]
+        self._staging.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    _discard_blocks = sync_wrapper(_async_discard_blocks)
+
     def flush(self, force=False):
         """
         Write buffered data to backend store.
@@ -1565,6 +3210,9 @@ class AzureBlobFile(io.IOBase):
         force: bool
             When closing, write the last block even if it is smaller than
             blocks are allowed to be. Disallows further writing to this file.
+
+        If the upload fails, the file is discarded, so that closing it does
+        not go on to commit the blocks of a failed upload.
         """
 
         if self.closed:
@@ -1577,27 +3225,31 @@ class AzureBlobFile(io.IOBase):
             # no-op to flush on read-mode
             return
 
-        if not force and self.buffer.tell() < self.blocksize:
+        if not force and self.buffered < self.blocksize:
             # Defer write on small block
             return
 
-        if self.offset is None:
-            # Initialize a multipart upload
-            self.offset = 0
-            self._initiate_upload()
-
-        if self._upload_chunk(final=force) is not False:
-            self.offset += self.buffer.seek(0, 2)
-            self.buffer = io.BytesIO()
+        try:
+            if self.offset is None:
+                # Initialize a multipart upload
+                self.offset = 0
+                self._initiate_upload()
+
+            if self._upload_chunk(final=force) is not False:
+                self.offset += self.buffered
+                self.buffered = 0
+        except BaseException:
+            self.discard()
+            raise
 
     def write(self, data):
         """
         Write data to buffer.
-        Buffer only sent on flush() or if buffer is greater than
-        or equal to blocksize.
+        Buffer only sent on flush() or when it fills up, so data longer than
+        blocksize is sent in blocksize pieces.
         Parameters
         ----------
-        data: bytes
+        data: bytes-like
             Set of bytes to be written.
         """
 
@@ -1607,10 +3259,16 @@ class AzureBlobFile(io.IOBase):
             raise ValueError("I/O operation on closed file.")
         if self.forced:
             raise ValueError("This file has been force-flushed, can only close")
-        out = self.buffer.write(data)
+        data = memoryview(data).cast("B")
+        out = len(data)
+        while data:
+            n = min(len(data), self.blocksize - self.buffered)
+            self.buffer[self.buffered : self.buffered + n] = data[:n]
+            self.buffered += n
+            data = data[n:]
+            if self.buffered >= self.blocksize:
+                self.flush()
         self.loc += out
-        if self.buffer.tell() >= self.blocksize:
-            self.flush()
         return out
 
     def readuntil(self, char=b"\n", blocks=None):
@@ -1713,8 +3371,12 @@ class AzureBlobFile(io.IOBase):
             if not self.forced:
                 self.flush(force=True)
             if self.fs is not None:
-                self.fs.invalidate_cache(self.path)
-                self.fs.invalidate_cache(self.fs._parent(self.path))
+                if self.mode == "wb" and self._commit_response is not None:
+                    self.fs._cache_written_file(
+                        self.path, self.offset, self._commit_response
+                    )
+                else:
+                    self.fs.invalidate_cache(self.path)
 
         self.closed = True
 
@@ -1,6 +1,9 @@
 import pytest
 
 from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobServiceClient as AIOBlobServiceClient
+
+from adlfs import AzureBlobFileSystem
 
 
 URL = "http://127.0.0.1:10000"
@@ -43,3 +46,21 @@ def storage(host):
     container_client.upload_blob("root/c/file1.txt", data)
     container_client.upload_blob("root/c/file2.txt", data)
     yield bbs
+
+
+@pytest.fixture
+def recording_fs(storage):
+    """
+    A filesystem of its own, and the list of the URLs of the requests it
+    sends, for tests of how many requests an operation makes
+    """
+    requests = []
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name,
+        connection_string=CONN_STR,
+        skip_instance_cache=True,
+    )
+    fs.service_client = AIOBlobServiceClient.from_connection_string(
+        CONN_STR, raw_response_hook=lambda r: requests.append(r.http_request.url)
+    )
+    return fs, requests
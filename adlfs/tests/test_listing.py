@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+from adlfs.listing import Listing
+
+
+def test_listing():
+    modified = datetime(2020, 9, 1, 12, 30, tzinfo=timezone.utc)
+    listing = Listing(
+        [
+            (
+                "data/root/rfile.txt",
+                10,
+                "file",
+                '"0x1"',
+                modified,
+                modified,
+                "0123abcd",
+                "BlockBlob",
+            ),
+            ("data/root/a/", 0, "directory"),
+            ("data/root/b", 0, "directory"),
+        ]
+    )
+
+    # entries are sorted by name, and materialized as dicts when accessed
+    assert len(listing) == 3
+    assert listing.names == ["data/root/a/", "data/root/b", "data/root/rfile.txt"]
+    assert listing[0] == {"name": "data/root/a/", "size": 0, "type": "directory"}
+    assert listing[-1] == {
+        "name": "data/root/rfile.txt",
+        "size": 10,
+        "type": "file",
+        "etag": '"0x1"',
+        "last_modified": modified,
+        "creation_time": modified,
+        "content_md5": "0123abcd",
+        "blob_type": "BlockBlob",
+    }
+    assert listing == [listing[0], listing[1], listing[2]]
+    assert Listing.from_entries(listing) == listing
+
+    # lookups find directories with or without the trailing delimiter
+    assert listing.get("data/root/a")["type"] == "directory"
+    assert listing.get("data/root/rfile.txt")["size"] == 10
+    assert listing.get("data/root/c") is None
+
+    assert listing.startswith("data/root/b").names == ["data/root/b"]
+    assert listing.with_delimiter().names == [
+        "data/root/a/",
+        "data/root/b/",
+        "data/root/rfile.txt",
+    ]
+    assert listing.files().names == ["data/root/rfile.txt"]
+    assert listing.updated([("data/root/b", 5, "file"), ("data/root/c", 1, "file")])[
+        1:
+    ] == [
+        {"name": "data/root/b", "size": 5, "type": "file"},
+        {"name": "data/root/c", "size": 1, "type": "file"},
+        listing[2],
+    ]
+    assert (listing.files() + listing[:1]).names == [
+        "data/root/a/",
+        "data/root/rfile.txt",
+    ]
+
+    put = listing[:]
+    put.put(("data/root/b", 5, "file"))
+    put.put(("data/root/aa.txt", 1, "file"))
+    assert put.names == [
+        "data/root/a/",
+        "data/root/aa.txt",
+        "data/root/b",
+        "data/root/rfile.txt",
+    ]
+    assert put.get("data/root/b") == {"name": "data/root/b", "size": 5, "type": "file"}
+    assert put.find("data/root/aa.txt") == 1
+    assert len(listing) == 3
+
+
+def test_listing_unknown_size():
+    listing = Listing.from_entries([{"name": "data/file", "type": "file"}])
+    assert listing[0] == {"name": "data/file", "size": None, "type": "file"}
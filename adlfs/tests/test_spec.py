@@ -1,13 +1,17 @@
 import asyncio
+import os
+import time
 import docker
 import dask.dataframe as dd
 from fsspec.implementations.local import LocalFileSystem
+from fsspec.utils import tokenize
 import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import pytest
 
 from adlfs import AzureBlobFileSystem, AzureBlobFile
+from adlfs.listing import Listing
 
 
 URL = "http://127.0.0.1:10000"
@@ -74,12 +78,17 @@ def test_ls(storage):
     assert fs.ls("/data/root/a/") == ["data/root/a/file.txt"]
 
     ## file details
-    assert fs.ls("data/root/a/file.txt", detail=True) == [
+    files = fs.ls("data/root/a/file.txt", detail=True)
+    assert [{k: f[k] for k in ["name", "size", "type"]} for f in files] == [
         {"name": "data/root/a/file.txt", "size": 10, "type": "file"}
     ]
+    assert files[0]["etag"]
+    assert files[0]["last_modified"]
 
     # c has two files
-    assert fs.ls("data/root/c", detail=True) == [
+    files = fs.ls("data/root/c", detail=True)
+    assert isinstance(files, list)
+    assert [{k: f[k] for k in ["name", "size", "type"]} for f in files] == [
         {"name": "data/root/c/file1.txt", "size": 10, "type": "file"},
         {"name": "data/root/c/file2.txt", "size": 10, "type": "file"},
     ]
@@ -95,6 +104,27 @@ def test_ls(storage):
         fs.ls("data/root/not-a-file.txt")
 
 
+def test_ls_direct_children_only(storage, recording_fs):
+    container_client = storage.create_container("ls-requests")
+    for i in range(10):
+        for j in range(10):
+            container_client.upload_blob(f"wide/dir{i}/file{j}.txt", b"0123456789")
+    container_client.upload_blob("wide/file.txt", b"0123456789")
+
+    fs, requests = recording_fs
+
+    # A single listing request for the 11 direct children, none for the
+    # contents of the 10 subdirectories
+    assert len(fs.ls("ls-requests/wide")) == 11
+    assert len(requests) == 1
+
+    requests.clear()
+    assert len(fs.ls("ls-requests/wide/dir0")) == 10
+    assert len(requests) == 1
+
+    fs.rm("ls-requests", recursive=True)
+
+
 def test_info(storage):
     fs = AzureBlobFileSystem(
         account_name=storage.account_name, connection_string=CONN_STR
@@ -110,7 +140,232 @@ def test_info(storage):
     assert dir_info == {"name": "data/root/c/", "type": "directory", "size": 0}
 
     file_info = fs.info("data/root/a/file.txt")
-    assert file_info == {"name": "data/root/a/file.txt", "type": "file", "size": 10}
+    assert {"name": "data/root/a/file.txt", "type": "file", "size": 10}.items() <= (
+        file_info.items()
+    )
+
+
+def test_info_without_listing(storage, monkeypatch):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name,
+        connection_string=CONN_STR,
+        skip_instance_cache=True,
+    )
+
+    async def _ls(*args, **kwargs):
+        raise AssertionError("info should not list the parent directory")
+
+    monkeypatch.setattr(fs, "_ls", _ls)
+    assert {"name": "data/root/a/file.txt", "type": "file", "size": 10}.items() <= (
+        fs.info("data/root/a/file.txt").items()
+    )
+    assert fs.info("data/root/c") == {
+        "name": "data/root/c/",
+        "type": "directory",
+        "size": 0,
+    }
+    assert fs.info("data") == {"name": "data/", "type": "directory", "size": 0}
+    assert fs.exists("data/root/rfile.txt")
+    assert fs.isfile("data/root/rfile.txt")
+    assert fs.size("data/root/rfile.txt") == 10
+    assert not fs.exists("data/root/missing.txt")
+    with pytest.raises(FileNotFoundError):
+        fs.info("data/root/missing.txt")
+
+
+def test_info_of_directory_marker(storage):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name,
+        connection_string=CONN_STR,
+        skip_instance_cache=True,
+    )
+    # mkdir writes an empty blob named after the directory
+    fs.mkdir("data/marker")
+    with fs.open("data/marker/existing.txt", "wb") as f:
+        f.write(b"0123")
+
+    # the details of the blob are not taken as the listing of the directory
+    assert fs.info("data/marker")["type"] == "file"
+    assert fs.exists("data/marker/existing.txt")
+    assert fs.ls("data/marker") == ["data/marker/existing.txt"]
+    with fs.open("data/marker/new.txt", "wb") as f:
+        f.write(b"0123")
+    assert fs.ls("data/marker") == [
+        "data/marker/existing.txt",
+        "data/marker/new.txt",
+    ]
+
+    fs.rm("data/marker", recursive=True)
+
+
+def test_info_after_listing(storage):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name,
+        connection_string=CONN_STR,
+        skip_instance_cache=True,
+    )
+    container_client = storage.get_container_client("data")
+    container_client.upload_blob("stale/file.txt", b"0123")
+    assert fs.info("data/stale/file.txt")["size"] == 4
+
+    # a newer listing takes the place of the details of its files
+    container_client.upload_blob("stale/file.txt", b"01234567", overwrite=True)
+    assert fs.ls("data/stale", detail=True)[0]["size"] == 8
+    assert fs.info("data/stale/file.txt")["size"] == 8
+
+    # and invalidating a directory discards the details of what it holds
+    container_client.upload_blob("stale/file.txt", b"0123456789", overwrite=True)
+    fs.invalidate_cache("data/stale")
+    assert fs.info("data/stale/file.txt")["size"] == 10
+
+    fs.rm("data/stale", recursive=True)
+
+
+def test_details_from_listing(recording_fs):
+    fs, requests = recording_fs
+
+    info = fs.info("data/root/a/file.txt")
+    assert info["blob_type"] == "BlockBlob"
+    assert {"etag", "last_modified", "creation_time"} <= set(info)
+
+    # A flat listing fills the cache for every directory below it, so the
+    # details and keys of its files need no further requests
+    fs.invalidate_cache()
+    files = fs.find("data/root")
+    requests.clear()
+    assert fs.ls("data/root/c", detail=True)[0]["name"] == "data/root/c/file1.txt"
+    assert fs.info("data/root/a/file.txt") == info
+    assert fs.ukey("data/root/a/file.txt") == tokenize(info["name"], info["etag"])
+    assert len({fs.checksum(f) for f in files}) == len(files)
+    assert fs.modified("data/root/a/file.txt") == info["last_modified"]
+    assert fs.created("data/root/a/file.txt") == info["creation_time"]
+    assert requests == []
+    with pytest.raises(IsADirectoryError):
+        fs.modified("data/root/a")
+
+    # and the key changes with the blob
+    ukey = fs.ukey("data/root/rfile.txt")
+    with fs.open("data/root/rfile.txt", "wb") as f:
+        f.write(b"0123456789")
+    assert fs.ukey("data/root/rfile.txt") != ukey
+
+
+def test_write_through_cache(recording_fs, tmpdir):
+    fs, requests = recording_fs
+    local = tmpdir.join("upload.txt")
+    local.write("0123456789ab")
+
+    fs.ls("data/root")
+    fs.ls("data/root/c")
+    with fs.open("data/root/new/file.txt", "wb") as f:
+        f.write(b"0123")
+    fs.put_file(str(local), "data/root/c/upload.txt")
+
+    # written files are added to the cached listings, which are not discarded
+    requests.clear()
+    assert "data/root/new/" in fs.ls("data/root")
+    assert fs.ls("data/root/c") == [
+        "data/root/c/file1.txt",
+        "data/root/c/file2.txt",
+        "data/root/c/upload.txt",
+    ]
+    assert fs.info("data/root/new/file.txt")["size"] == 4
+    assert fs.info("data/root/c/upload.txt")["size"] == 12
+    assert "etag" in fs.info("data/root/c/upload.txt")
+    assert requests == []
+
+    # the MD5 returned by a block list commit is not that of the blob
+    fs.blocksize = 5
+    fs.put_file(str(local), "data/root/c/blocks.txt")
+    with fs.open("data/root/c/written.txt", "wb", block_size=5) as f:
+        f.write(b"0123456789ab")
+    requests.clear()
+    assert fs.info("data/root/c/blocks.txt").get("content_md5") is None
+    assert fs.info("data/root/c/written.txt").get("content_md5") is None
+    assert requests == []
+
+    fs.rm("data/root/new", recursive=True)
+    fs.rm(["data/root/c/blocks.txt", "data/root/c/written.txt"])
+    fs.rm("data/root/c/upload.txt")
+    assert "data/root/new/" not in fs.ls("data/root")
+    assert fs.ls("data/root/c") == ["data/root/c/file1.txt", "data/root/c/file2.txt"]
+
+
+def test_info_many(recording_fs):
+    fs, requests = recording_fs
+    fs.max_concurrency = 2
+
+    paths = [
+        "data/root/a/file.txt",
+        "data/root/c",
+        "data/root/missing.txt",
+        "abfs://data/root/rfile.txt",
+    ]
+    infos = fs.info_many(paths, on_error="return")
+    assert [info["name"] for info in infos[:2]] == [
+        "data/root/a/file.txt",
+        "data/root/c/",
+    ]
+    assert isinstance(infos[2], FileNotFoundError)
+    assert infos[3]["size"] == 10
+    assert fs.exists_many(paths) == [True, True, False, True]
+    with pytest.raises(FileNotFoundError):
+        fs.info_many(paths)
+    with pytest.raises(FileNotFoundError):
+        fs.sizes(paths)
+
+    # paths in a cached listing are answered without requests
+    fs.ls("data/root/c")
+    requests.clear()
+    assert fs.sizes(["data/root/c/file1.txt", "data/root/c/file2.txt"]) == [10, 10]
+    assert fs.exists_many(["data/root/c/missing.txt"], max_concurrency=1) == [False]
+    assert requests == []
+
+
+def test_missing_paths_cache(storage, recording_fs):
+    fs, requests = recording_fs
+
+    # repeated checks for a missing path only go to Azure once
+    assert not fs.exists("data/root/_SUCCESS")
+    assert requests
+    requests.clear()
+    assert not fs.exists("data/root/_SUCCESS")
+    assert not fs.isfile("data/root/_SUCCESS")
+    with pytest.raises(FileNotFoundError):
+        fs.info("data/root/_SUCCESS")
+    assert requests == []
+
+    # writing to the path, or below it, makes it exist again
+    with fs.open("data/root/_SUCCESS", "wb") as f:
+        f.write(b"")
+    assert fs.exists("data/root/_SUCCESS")
+    fs.rm("data/root/_SUCCESS")
+
+    assert not fs.exists("data/missing-dir")
+    fs.mkdir("data/missing-dir/file.txt")
+    assert fs.exists("data/missing-dir")
+    fs.rm("data/missing-dir", recursive=True)
+
+    # and the cache can be turned off
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name,
+        connection_string=CONN_STR,
+        missing_paths_expiry_time=0,
+    )
+    assert not fs.exists("data/root/_SUCCESS")
+    assert "data/root/_SUCCESS" not in fs.missing_paths
+
+    # only the most recent missing paths are kept
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name,
+        connection_string=CONN_STR,
+        skip_instance_cache=True,
+        max_missing_paths=5,
+    )
+    for i in range(20):
+        assert not fs.exists(f"data/root/missing{i}")
+        assert len(fs.missing_paths) <= 5
+    assert list(fs.missing_paths) == [f"data/root/missing{i}" for i in range(15, 20)]
 
 
 def test_find(storage):
@@ -173,7 +428,6 @@ def test_find(storage):
     assert fs.find("data/missing") == []
 
 
-@pytest.mark.xfail
 def test_find_missing(storage):
     fs = AzureBlobFileSystem(
         account_name=storage.account_name, connection_string=CONN_STR
@@ -181,6 +435,81 @@ def test_find_missing(storage):
     assert fs.find("data/roo") == []
 
 
+def test_find_flat_listing(storage, monkeypatch):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name, connection_string=CONN_STR
+    )
+
+    async def _ls(*args, **kwargs):
+        raise AssertionError("an unbounded find should not list directories")
+
+    # find, ** globs and recursive expansion all use a single flat listing
+    monkeypatch.setattr(fs, "_ls", _ls)
+    assert fs.find("data/root", withdirs=True) == [
+        "data/root/a",
+        "data/root/a/file.txt",
+        "data/root/b",
+        "data/root/b/file.txt",
+        "data/root/c",
+        "data/root/c/file1.txt",
+        "data/root/c/file2.txt",
+        "data/root/rfile.txt",
+    ]
+    assert fs.glob("data/root/**/*.txt") == [
+        "data/root/a/file.txt",
+        "data/root/b/file.txt",
+        "data/root/c/file1.txt",
+        "data/root/c/file2.txt",
+    ]
+    assert fs.expand_path("data/root/c", recursive=True) == [
+        "data/root/c",
+        "data/root/c/file1.txt",
+        "data/root/c/file2.txt",
+    ]
+    assert {"name": "data/root/a/file.txt", "type": "file", "size": 10}.items() <= (
+        fs.find("data/root", detail=True)["data/root/a/file.txt"].items()
+    )
+
+
+def test_walk(storage, recording_fs, monkeypatch):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name,
+        connection_string=CONN_STR,
+        walk_concurrency=2,
+    )
+
+    assert list(fs.walk("data/root")) == [
+        ("data/root", ["a", "b", "c"], ["rfile.txt"]),
+        ("data/root/a", [], ["file.txt"]),
+        ("data/root/b", [], ["file.txt"]),
+        ("data/root/c", [], ["file1.txt", "file2.txt"]),
+    ]
+    assert list(fs.walk("data/root", maxdepth=1)) == [
+        ("data/root", ["a", "b", "c"], ["rfile.txt"]),
+    ]
+
+    # levels are listed as they are reached, and pruned dirs are skipped
+    fs, requests = recording_fs
+    walk = fs.walk("data/root")
+    root, dirs, files = next(walk)
+    assert len(requests) == 1
+    dirs.remove("b")
+    assert [p for p, _, _ in walk] == ["data/root/a", "data/root/c"]
+    assert len(requests) == 3
+
+    assert fs.du("data/root") == 50
+    assert fs.du("data/root", total=False, maxdepth=1) == {"data/root/rfile.txt": 10}
+
+    # entries of unknown size count as empty
+    async def find_listing(path, **kwargs):
+        return Listing(
+            [("data/root/rfile.txt", 10, "file"), ("data/root/x", None, "file")]
+        )
+
+    monkeypatch.setattr(fs, "_find_listing", find_listing)
+    assert fs.du("data/root") == 10
+
+
 def test_glob(storage):
     fs = AzureBlobFileSystem(
         account_name=storage.account_name, connection_string=CONN_STR
@@ -272,6 +601,54 @@ def test_open_file(storage):
     assert result == b"0123456789"
 
 
+def test_open_without_info(recording_fs):
+    fs, requests = recording_fs
+
+    # details of found files are taken from the cached listings
+    paths = fs.find("data/root")
+    requests.clear()
+    for path in paths:
+        with fs.open(path) as f:
+            assert f.read() == b"0123456789"
+    assert len(requests) == len(paths)
+
+    # or given when opening
+    fs.invalidate_cache()
+    requests.clear()
+    with fs.open("data/root/rfile.txt", size=10) as f:
+        assert f.size == 10
+        assert f.read() == b"0123456789"
+    details = {"name": "data/top_file.txt", "size": 10, "type": "file"}
+    with fs.open("data/top_file.txt", details=details) as f:
+        assert f.details == details
+        assert f.read() == b"0123456789"
+    assert len(requests) == 2
+
+
+@pytest.mark.parametrize("cache_type", ["none", "mmap", "bytes", "readahead", "block"])
+def test_read_ranges_exactly(storage, cache_type):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name, connection_string=CONN_STR
+    )
+    data = bytes(range(100)) * 10
+    with fs.open("data/ranges.bin", "wb") as f:
+        f.write(data)
+
+    with fs.open("data/ranges.bin", "rb", block_size=100, cache_type=cache_type) as f:
+        for start in [900, 0, 450, 995]:
+            f.seek(start)
+            assert f.read(10) == data[start : start + 10]
+        # only the bytes asked for come back, and each read costs at most
+        # the read itself and the two blocks around it
+        assert f.bytes_received == f.bytes_requested
+        assert 0 < f.bytes_requested <= 4 * (10 + 2 * 100)
+        f.seek(0)
+        assert f.read() == data
+        assert f.bytes_received == f.bytes_requested
+
+    fs.rm("data/ranges.bin")
+
+
 def test_rm(storage):
     fs = AzureBlobFileSystem(
         account_name=storage.account_name, connection_string=CONN_STR
@@ -301,6 +678,20 @@ def test_rm_recursive(storage):
         fs.ls("data/root/c")
 
 
+def test_rm_in_batches(recording_fs, tmpdir):
+    fs, requests = recording_fs
+    for i in range(300):
+        tmpdir.join(f"file{i}.txt").write("0")
+    fs.put(str(tmpdir), "data/batch", recursive=True)
+    requests.clear()
+
+    # one listing, then two batches for the 300 blobs and the directory itself
+    fs.rm("data/batch", recursive=True)
+    assert len(requests) == 1 + 2
+    assert not fs.exists("data/batch")
+    assert "data/batch/" not in fs.ls("data")
+
+
 def test_mkdir_rmdir(storage):
     fs = AzureBlobFileSystem(
         account_name=storage.account_name, connection_string=CONN_STR,
@@ -430,6 +821,138 @@ def test_deep_paths(storage):
     assert fs.find("test_deep") == []
 
 
+def test_write_blocks_in_background(storage):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name, connection_string=CONN_STR
+    )
+
+    parts = [str(i).encode() * 10 for i in range(10)]
+    with fs.open(
+        "data/background/file.txt", "wb", block_size=10, max_concurrency=2
+    ) as f:
+        for part in parts:
+            f.write(part)
+            # blocks are staged without waiting for earlier ones, but never
+            # more than max_concurrency at once
+            assert len(f._staging) <= 2
+        assert f._block_list == [f"{i:07d}" for i in range(10)]
+
+    assert fs.cat("data/background/file.txt") == b"".join(parts)
+    fs.rm("data/background", recursive=True)
+
+
+def test_write_blocks_failed(storage):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name, connection_string=CONN_STR
+    )
+    tasks = []
+
+    class FailingBlobClient:
+        def __init__(self, client):
+            self.client = client
+
+        def __getattr__(self, name):
+            return getattr(self.client, name)
+
+        async def stage_block(self, block_id, **kwargs):
+            tasks.append(asyncio.current_task())
+            if block_id in ["0000001", "0000002"]:
+                raise ValueError("stage failed")
+            await asyncio.sleep(0.5)
+            await self.client.stage_block(block_id=block_id, **kwargs)
+
+    class FailingContainerClient(FailingBlobClient):
+        def get_blob_client(self, blob):
+            return FailingBlobClient(self.client.get_blob_client(blob))
+
+    f = fs.open("data/failed/file.txt", "wb", block_size=10, max_concurrency=4)
+    f.container_client = FailingContainerClient(f.container_client)
+    with pytest.raises(RuntimeError, match="stage failed"):
+        with f:
+            for i in range(4):
+                f.write(str(i).encode() * 10)
+
+    # every staged block has settled, and nothing was committed
+    assert len(tasks) == 4
+    assert all(task.done() for task in tasks)
+    assert not f._staging
+    assert not fs.exists("data/failed/file.txt")
+    f.close()
+    assert f.closed
+
+    # a block which fails during a write fails that write, and closing the
+    # file afterwards does not try to commit the blocks
+    f = fs.open("data/failed/file.txt", "wb", block_size=10, max_concurrency=1)
+    f.container_client = FailingContainerClient(f.container_client)
+    with pytest.raises(RuntimeError, match="stage failed"):
+        with f:
+            for i in range(4):
+                f.write(str(i).encode() * 10)
+    assert f.closed
+    assert not fs.exists("data/failed/file.txt")
+
+    # blocks in flight are cancelled when the file is discarded
+    f = fs.open("data/failed/file.txt", "wb", block_size=10)
+    f.container_client = FailingContainerClient(f.container_client)
+    f.write(b"0" * 10)
+    [(task, _)] = f._staging
+    f.discard()
+    assert task.cancelled()
+    assert not f._staging
+    f.close()
+    assert not fs.exists("data/failed/file.txt")
+
+
+def test_write_buffers_reused(storage):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name, connection_string=CONN_STR
+    )
+
+    data = bytes(range(256)) * 4
+    with fs.open("data/buffers/file.bin", "wb", block_size=100, max_concurrency=2) as f:
+        # a single write larger than the block size is split into blocks
+        f.write(memoryview(data)[:1000])
+        f.write(bytearray(data[1000:]))
+        assert len(f._block_list) == 10
+        assert f.buffered == 24
+        buffers = [f.buffer, *f._free_buffers, *(b for _, b in f._staging)]
+        # one buffer being written to, and one for each block in flight
+        assert len(buffers) <= 3
+        assert all(len(b) == 100 for b in buffers)
+
+    assert fs.cat("data/buffers/file.bin") == data
+    fs.rm("data/buffers", recursive=True)
+
+
+def test_write_small_file_in_one_request(recording_fs):
+    # files make their requests through the filesystem's client, so they
+    # are recorded along with its own
+    fs, requests = recording_fs
+    with fs.open("data/small/file.txt", "wb") as f:
+        f.write(b"old contents")
+    assert len(requests) == 1
+
+    # an existing blob is overwritten without being deleted first
+    requests.clear()
+    with fs.open("data/small/file.txt", "wb") as f:
+        f.write(b"new")
+    assert len(requests) == 1
+
+    requests.clear()
+    with fs.open("data/small/file.txt", "rb") as f:
+        assert f.read() == b"new"
+    # one request for the blob's details, and one for its contents
+    assert len(requests) == 2
+
+    requests.clear()
+    with fs.open("data/small/empty.txt", "wb"):
+        pass
+    assert len(requests) == 1
+    assert fs.cat("data/small/empty.txt") == b""
+
+    fs.rm("data/small", recursive=True)
+
+
 def test_large_blob(storage):
     import tempfile
     import hashlib
@@ -681,6 +1204,368 @@ def test_put_file(storage):
     fs.rm("putdir", recursive=True)
 
 
+def test_put_directory(storage, tmpdir, monkeypatch):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name, connection_string=CONN_STR
+    )
+    for i in range(4):
+        for j in range(5):
+            tmpdir.join(f"dir{i}", f"file{j}.txt").write(f"{i}{j}", ensure=True)
+    tmpdir.mkdir("empty")
+
+    in_flight = []
+    most_in_flight = []
+    upload_file = fs._upload_file
+
+    async def _upload_file(*args, **kwargs):
+        in_flight.append(args)
+        most_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        try:
+            return await upload_file(*args, **kwargs)
+        finally:
+            in_flight.remove(args)
+
+    monkeypatch.setattr(fs, "_upload_file", _upload_file)
+    fs.mkdir("putdir")
+    assert fs.ls("putdir") == []
+    fs.put(str(tmpdir), "putdir/tree", recursive=True, max_concurrency=4)
+
+    assert 1 < max(most_in_flight) <= 4
+    assert fs.ls("putdir") == ["putdir/tree/"]
+    assert len(fs.find("putdir/tree")) == 20
+    assert fs.cat("putdir/tree/dir3/file4.txt") == b"34"
+
+    # once an upload fails, the others are cancelled before put raises
+    async def failing_upload_file(lpath, rpath, **kwargs):
+        if len(in_flight) == 2:
+            raise OSError("upload failed")
+        in_flight.append(rpath)
+        try:
+            await asyncio.sleep(10)
+        finally:
+            in_flight.remove(rpath)
+
+    monkeypatch.setattr(fs, "_upload_file", failing_upload_file)
+    with pytest.raises(OSError, match="upload failed"):
+        fs.put(str(tmpdir), "putdir/failed", recursive=True, max_concurrency=4)
+    assert in_flight == []
+    fs.rm("putdir", recursive=True)
+
+
+def test_get_directory(recording_fs, tmpdir, monkeypatch):
+    fs, requests = recording_fs
+    fs.mkdir("getdir")
+    for i in range(3):
+        for j in range(4):
+            with fs.open(f"getdir/tree/dir{i}/file{j}.txt", "wb") as f:
+                f.write(f"{i}{j}".encode())
+    fs.invalidate_cache()
+    requests.clear()
+
+    # one listing of the tree, then one request for each file
+    fs.get("getdir/tree", str(tmpdir.join("tree")), recursive=True, max_concurrency=3)
+    assert len(requests) == 1 + 12
+    assert tmpdir.join("tree", "dir2", "file3.txt").read() == "23"
+    assert len(tmpdir.join("tree").listdir()) == 3
+
+    fs.get_file("getdir/tree/dir0/file1.txt", str(tmpdir.join("single.txt")))
+    assert tmpdir.join("single.txt").read() == "01"
+
+    # once a download fails, the others are cancelled before get raises
+    in_flight = []
+
+    async def failing_download_file(rpath, lpath, **kwargs):
+        if len(in_flight) == 2:
+            raise OSError("download failed")
+        in_flight.append(rpath)
+        try:
+            await asyncio.sleep(10)
+        finally:
+            in_flight.remove(rpath)
+
+    monkeypatch.setattr(fs, "_download_file", failing_download_file)
+    with pytest.raises(OSError, match="download failed"):
+        fs.get("getdir/tree", str(tmpdir.join("failed")), recursive=True)
+    assert in_flight == []
+    fs.rm("getdir", recursive=True)
+
+
+def test_get_file_in_ranges(storage, recording_fs, tmpdir, monkeypatch):
+    fs, requests = recording_fs
+    fs.blocksize = 10
+    fs.max_concurrency = 3
+    data = bytes(range(95))
+    fs.mkdir("rangedir")
+    with fs.open("rangedir/file.bin", "wb") as f:
+        f.write(data)
+    fs.invalidate_cache()
+    requests.clear()
+
+    # one request for the size of the blob, then one for each range
+    fs.get_file("rangedir/file.bin", str(tmpdir.join("file.bin")))
+    assert len(requests) == 1 + 10
+    assert tmpdir.join("file.bin").read_binary() == data
+
+    # without os.pwrite, ranges written at once still land at their own offsets
+    monkeypatch.delattr("os.pwrite", raising=False)
+    fs.get_file("rangedir/file.bin", str(tmpdir.join("seeked.bin")))
+    assert tmpdir.join("seeked.bin").read_binary() == data
+
+    # ranges are only fetched from the version of the blob whose size is known,
+    # and a blob overwritten since is downloaded again with its new details
+    stale = fs.info("rangedir/file.bin")
+    storage.get_blob_client("rangedir", "file.bin").upload_blob(
+        data[::-1], overwrite=True
+    )
+    fs.get_file("rangedir/file.bin", str(tmpdir.join("changed.bin")))
+    assert tmpdir.join("changed.bin").read_binary() == data[::-1]
+
+    # a blob which keeps changing fails the download, with no partial file
+    async def _info(path, **kwargs):
+        return stale
+
+    with monkeypatch.context() as m:
+        m.setattr(fs, "_info", _info)
+        with pytest.raises(OSError, match="modified"):
+            fs.get_file("rangedir/file.bin", str(tmpdir.join("failed.bin")))
+    assert not tmpdir.join("failed.bin").exists()
+
+    # a failed range fails the download with its own error, and leaves no
+    # partial file behind
+    def failing_write_at(f, data, offset, lock):
+        if offset:
+            raise OSError("disk full")
+        f.write(data)
+
+    monkeypatch.setattr("adlfs.spec._write_at", failing_write_at)
+    with pytest.raises(OSError, match="disk full"):
+        fs.get_file("rangedir/file.bin", str(tmpdir.join("failed.bin")))
+    assert not tmpdir.join("failed.bin").exists()
+
+    # and the writes still running then are finished before the file is closed
+    started, finished = [], []
+
+    def slow_write_at(f, data, offset, lock):
+        started.append(offset)
+        time.sleep(0.05 if offset == 10 else 0.2)
+        if offset == 10:
+            raise OSError("disk full")
+        f.fileno()  # raises once the file is closed
+        finished.append(offset)
+
+    monkeypatch.setattr("adlfs.spec._write_at", slow_write_at)
+    with pytest.raises(OSError, match="disk full"):
+        fs.get_file("rangedir/file.bin", str(tmpdir.join("failed.bin")))
+    assert len(finished) == len(started) - 1
+    assert not tmpdir.join("failed.bin").exists()
+    fs.rm("rangedir", recursive=True)
+
+
+def test_put_file_in_blocks(recording_fs, tmpdir, monkeypatch):
+    fs, requests = recording_fs
+    fs.blocksize = 10
+    fs.mkdir("blockdir")
+    data = bytes(range(95))
+    local = tmpdir.join("file.bin")
+    local.write_binary(data)
+
+    # ten staged blocks and one commit
+    requests.clear()
+    fs.put_file(str(local), "blockdir/file.bin", max_concurrency=3)
+    assert len(requests) == 10 + 1
+    assert fs.cat("blockdir/file.bin") == data
+    with pytest.raises(FileExistsError):
+        fs.put_file(str(local), "blockdir/file.bin")
+
+    # blocks grow to keep within the number a blob may have
+    monkeypatch.setattr("adlfs.spec.MAX_BLOCKS_PER_BLOB", 4)
+    requests.clear()
+    fs.put_file(str(local), "blockdir/file.bin", overwrite=True)
+    assert len(requests) == 4 + 1
+    assert fs.cat("blockdir/file.bin") == data
+
+    # without os.pread, blocks read at once still come from their own offsets
+    monkeypatch.delattr("os.pread", raising=False)
+    fs.put_file(str(local), "blockdir/seeked.bin", max_concurrency=3)
+    assert fs.cat("blockdir/seeked.bin") == data
+
+    # one failed block fails the upload, without committing the blob
+    def failing_read_at(f, length, offset, lock):
+        if offset:
+            raise OSError("read failed")
+        return b"0" * length
+
+    monkeypatch.setattr("adlfs.spec._read_at", failing_read_at)
+    with pytest.raises(OSError, match="read failed"):
+        fs.put_file(str(local), "blockdir/failed.bin")
+    assert not fs.exists("blockdir/failed.bin")
+    monkeypatch.undo()
+
+    # the blocks in flight are bounded across all the files being put
+    semaphores = set()
+    upload_blocks = fs._upload_blocks
+
+    async def recorded_upload_blocks(*args):
+        semaphores.add(args[-1])
+        return await upload_blocks(*args)
+
+    monkeypatch.setattr(fs, "_upload_blocks", recorded_upload_blocks)
+    many = tmpdir.mkdir("many")
+    for name in ["a.bin", "b.bin", "c.bin"]:
+        many.join(name).write_binary(data)
+    fs.put(str(many), "blockdir/many", recursive=True)
+    assert len(semaphores) == 1
+    assert fs.cat("blockdir/many/c.bin") == data
+    fs.rm("blockdir", recursive=True)
+
+
+def test_copy_and_mv_recursive(storage, monkeypatch):
+    fs = AzureBlobFileSystem(
+        account_name=storage.account_name, connection_string=CONN_STR
+    )
+    fs.mkdir("copydir")
+    for name in ["a.txt", "sub/b.txt", "sub/deeper/c.txt"]:
+        with fs.open(f"copydir/src/{name}", "wb") as f:
+            f.write(name.encode())
+
+    fs.copy("copydir/src", "copydir/dst", recursive=True, max_concurrency=2)
+    assert fs.find("copydir/dst") == [
+        "copydir/dst/a.txt",
+        "copydir/dst/sub/b.txt",
+        "copydir/dst/sub/deeper/c.txt",
+    ]
+    assert fs.cat("copydir/dst/sub/deeper/c.txt") == b"sub/deeper/c.txt"
+    assert len(fs.find("copydir/src")) == 3
+
+    fs.mv("copydir/dst", "copydir/moved", recursive=True)
+    assert fs.find("copydir/moved") == [
+        "copydir/moved/a.txt",
+        "copydir/moved/sub/b.txt",
+        "copydir/moved/sub/deeper/c.txt",
+    ]
+    assert not fs.exists("copydir/dst")
+    assert fs.ls("copydir") == ["copydir/moved/", "copydir/src/"]
+
+    # once a copy fails, the others are cancelled, and nothing is moved
+    in_flight = []
+
+    async def failing_cp_file(path1, path2, **kwargs):
+        if len(in_flight) == 2:
+            raise RuntimeError("copy failed")
+        in_flight.append(path1)
+        try:
+            await asyncio.sleep(10)
+        finally:
+            in_flight.remove(path1)
+
+    monkeypatch.setattr(fs, "_cp_file", failing_cp_file)
+    with pytest.raises(RuntimeError, match="copy failed"):
+        fs.mv("copydir/src", "copydir/failed", recursive=True)
+    assert in_flight == []
+    assert len(fs.find("copydir/src")) == 3
+    fs.rm("copydir", recursive=True)
+
+
+def test_cp_file_in_blocks(recording_fs):
+    fs, requests = recording_fs
+    fs.blocksize = 10
+    data = bytes(range(95))
+    fs.mkdir("blockcopy")
+    with fs.open("blockcopy/src.bin", "wb") as f:
+        f.write(data)
+    fs.invalidate_cache()
+    requests.clear()
+
+    # the details of the source, ten blocks staged from it and one commit
+    fs.cp_file(
+        "blockcopy/src.bin",
+        "blockcopy/dst.bin",
+        block_copy=True,
+        block_size=10,
+        max_concurrency=3,
+    )
+    assert len(requests) == 1 + 10 + 1
+    assert fs.cat("blockcopy/dst.bin") == data
+
+    # copied blocks are not limited by the filesystem's blocksize, so one
+    # block is staged and committed
+    requests.clear()
+    fs.cp_file("blockcopy/src.bin", "blockcopy/dst2.bin", block_copy=True)
+    assert len(requests) == 1 + 1 + 1
+    assert fs.cat("blockcopy/dst2.bin") == data
+
+    # the size of the source is looked up afresh, rather than taken from a
+    # cache which predates an overwrite
+    with fs.open("blockcopy/src.bin", "wb") as f:
+        f.write(data[:50])
+    fs.dircache["blockcopy"] = Listing([("blockcopy/src.bin", 95, "file")])
+    fs.cp_file("blockcopy/src.bin", "blockcopy/dst3.bin", block_copy=True)
+    assert fs.cat("blockcopy/dst3.bin") == data[:50]
+    fs.rm("blockcopy", recursive=True)
+
+
+def test_sync(recording_fs, tmpdir):
+    fs, requests = recording_fs
+    fs.mkdir("syncdir")
+    src = tmpdir.mkdir("src")
+    for name in ["a.txt", "sub/b.txt", "sub/c.txt"]:
+        src.join(name).write(name, ensure=True)
+
+    result = fs.sync(str(src), "syncdir/models")
+    assert len(result["transferred"]) == 3
+    assert fs.cat("syncdir/models/sub/b.txt") == b"sub/b.txt"
+
+    # an unchanged tree costs a single listing
+    requests.clear()
+    assert fs.sync(str(src), "syncdir/models") == {"transferred": [], "deleted": []}
+    assert len(requests) == 1
+
+    src.join("a.txt").write("changed")
+    src.join("sub", "c.txt").remove()
+    result = fs.sync(str(src), "syncdir/models", delete=True)
+    assert result == {
+        "transferred": ["syncdir/models/a.txt"],
+        "deleted": ["syncdir/models/sub/c.txt"],
+    }
+    assert fs.find("syncdir/models") == [
+        "syncdir/models/a.txt",
+        "syncdir/models/sub/b.txt",
+    ]
+
+    # modified times only count as later beyond the tolerance for the clocks
+    modified = fs.modified("syncdir/models/a.txt").timestamp()
+    os.utime(str(src.join("a.txt")), (modified + 0.5, modified + 0.5))
+    assert fs.sync(str(src), "syncdir/models")["transferred"] == []
+    os.utime(str(src.join("a.txt")), (modified + 5, modified + 5))
+    assert fs.sync(str(src), "syncdir/models", tolerance=10)["transferred"] == []
+    result = fs.sync(str(src), "syncdir/models")
+    assert result["transferred"] == ["syncdir/models/a.txt"]
+
+    dst = tmpdir.join("dst")
+    result = fs.sync("syncdir/models", str(dst), direction="download")
+    assert len(result["transferred"]) == 2
+    assert dst.join("a.txt").read() == "changed"
+    dst.join("extra.txt").write("extra")
+    result = fs.sync(
+        "syncdir/models", str(dst), direction="download", delete=True, checksum=True
+    )
+    assert result == {"transferred": [], "deleted": [str(dst.join("extra.txt"))]}
+    assert not dst.join("extra.txt").exists()
+
+    # a missing source is an error, rather than a reason to empty dst
+    with pytest.raises(FileNotFoundError):
+        fs.sync(str(tmpdir.join("missing")), "syncdir/models", delete=True)
+    with pytest.raises(FileNotFoundError):
+        fs.sync("syncdir/missing", str(dst), direction="download", delete=True)
+    assert fs.find("syncdir/models") == [
+        "syncdir/models/a.txt",
+        "syncdir/models/sub/b.txt",
+    ]
+    assert dst.join("a.txt").exists()
+    fs.rm("syncdir", recursive=True)
+
+
 @pytest.mark.skip
 def test_isdir(storage):
     pass
@@ -698,6 +1583,60 @@ def test_cat(storage):
     fs.rm("catdir/catfile.txt")
 
 
+def test_cat_many(recording_fs):
+    fs, requests = recording_fs
+    fs.max_concurrency = 2
+
+    # one request for each file, and none to check on them first
+    paths = ["data/root/b/file.txt", "data/root/rfile.txt", "data/top_file.txt"]
+    assert fs.cat(paths) == {path: b"0123456789" for path in paths}
+    assert len(requests) == 3
+
+    missing = paths + ["data/root/missing.txt"]
+    with pytest.raises(FileNotFoundError):
+        fs.cat(missing)
+    assert list(fs.cat(missing, on_error="omit")) == paths
+    assert isinstance(
+        fs.cat(missing, on_error="return")["data/root/missing.txt"], FileNotFoundError
+    )
+
+    assert fs.cat_file("data/root/rfile.txt", start=2, end=5) == b"234"
+    assert fs.cat_file("data/root/rfile.txt", start=-3) == b"789"
+    assert fs.cat_file("data/root/rfile.txt", end=-8) == b"01"
+    assert fs.cat_file("data/root/rfile.txt", start=5, end=5) == b""
+
+
+def test_cat_ranges(recording_fs):
+    fs, requests = recording_fs
+    paths = ["data/top_file.txt"] * 3 + ["data/root/rfile.txt"]
+    starts = [8, 0, 3, 4]
+    ends = [10, 2, 5, 6]
+    expected = [b"89", b"01", b"34", b"45"]
+
+    # the first two ranges of top_file.txt are one byte apart, so are merged
+    results = fs.cat_ranges(paths, starts, ends, max_gap=1)
+    assert results == expected
+    assert all(type(result) is bytes for result in results)
+    assert len(requests) == 3
+    requests.clear()
+    assert fs.cat_ranges(paths, starts, ends, max_gap=0) == expected
+    assert len(requests) == 4
+    requests.clear()
+    assert fs.cat_ranges(paths, starts, ends, max_gap=10, max_block=5) == expected
+    assert len(requests) == 3
+
+    fs.ls("data")
+    assert fs.cat_ranges(["data/top_file.txt"] * 2, [-2, None], [None, 1]) == [
+        b"89",
+        b"0",
+    ]
+    results = fs.cat_ranges(["data/top_file.txt", "data/missing.txt"], [0, 0], [1, 1])
+    assert results[0] == b"0"
+    assert isinstance(results[1], FileNotFoundError)
+    with pytest.raises(FileNotFoundError):
+        fs.cat_ranges(["data/missing.txt"], [0], [1], on_error="raise")
+
+
 def test_cp_file(storage):
     fs = AzureBlobFileSystem(
         account_name=storage.account_name, connection_string=CONN_STR